@@ -5,6 +5,11 @@ from .translator import ProtocolTranslator, TranslationResult
 from .store import BridgeStore, TxStatus
 from .security import SecurityGateway, PolicyDecision, SecurityError
 from .crypto import sign_message, verify_signature, canonical_json, content_hash
+from .keyring import KeyRing, KeyRingError
+from .dispatch import HashRing, ShardedDispatcher
+from .schemas import SchemaRegistry, SchemaCompileError, SchemaValidationError
+from .analytics import AnalyticsSink
+from .wire import EncodedResponse, WireReply, encode_response
 
 __all__ = [
     "MCPAIPBridge",
@@ -19,4 +24,15 @@ __all__ = [
     "verify_signature",
     "canonical_json",
     "content_hash",
+    "KeyRing",
+    "KeyRingError",
+    "HashRing",
+    "ShardedDispatcher",
+    "SchemaRegistry",
+    "SchemaCompileError",
+    "SchemaValidationError",
+    "AnalyticsSink",
+    "EncodedResponse",
+    "WireReply",
+    "encode_response",
 ]
@@ -0,0 +1,310 @@
+"""Batched ingestion of translated evidence into ``integrated_analytics``."""
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from uuid import UUID, uuid5
+
+from .translator import TranslationResult
+
+try:
+    import asyncpg  # type: ignore
+except ImportError:  # pragma: no cover
+    asyncpg = None  # type: ignore
+
+COLUMNS = (
+    "analytics_id",
+    "patient_id",
+    "module_source",
+    "metric_type",
+    "metric_value",
+    "correlation_data",
+    "timestamp",
+)
+
+
+class AnalyticsSink:
+    """Buffers patient evidence and writes it to ``integrated_analytics`` in batches.
+
+    A background flusher (started by ``init``, or by the first ``offer``
+    if ``init`` was never awaited) writes rows when
+    ``flush_size`` is reached or the oldest buffered row is
+    ``flush_interval`` seconds old, backing off exponentially (up to
+    ``max_backoff``) after a failed write. Each row's ``analytics_id`` is a
+    UUIDv5 of the bridge ``thread_id`` and the item position, so replays of
+    the same request produce the same ids and are skipped on insert. The
+    buffer never holds more than ``max_buffer`` rows; if flushes keep
+    failing, the oldest rows are dropped and counted in ``dropped``.
+    """
+
+    def __init__(
+        self,
+        db_url: str,
+        *,
+        module_source: str = "mcp-aip-bridge",
+        flush_size: int = 500,
+        flush_interval: float = 5.0,
+        max_buffer: int = 10000,
+        backoff_base: float = 1.0,
+        max_backoff: float = 30.0,
+    ) -> None:
+        if flush_size > max_buffer:
+            raise ValueError("flush_size must not exceed max_buffer")
+        self.db_url = db_url
+        self.module_source = module_source
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self.backoff_base = backoff_base
+        self.max_backoff = max_backoff
+        self.pool: Optional[Any] = None
+        self.dropped = 0
+        self.last_error: Optional[BaseException] = None
+        self._in_memory = False
+        self._connected = False
+        self._memory_rows: Dict[UUID, Tuple[Any, ...]] = {}
+        self._buffer: List[Tuple[Any, ...]] = []
+        self._buffered_ids: set = set()
+        self._oldest: Optional[float] = None
+        self._failures = 0
+        self._retry_at = 0.0
+        self._flush_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    async def init(self) -> None:
+        """Connect (falling back to memory) and start the background flusher."""
+        async with self._flush_lock:
+            await self._connect()
+        self._ensure_flusher()
+
+    async def _connect(self) -> None:
+        if self._connected:
+            return
+        if self.db_url.startswith("memory://") or asyncpg is None:
+            self._in_memory = True
+        else:
+            try:
+                self.pool = await asyncpg.create_pool(self.db_url, min_size=1, max_size=2)  # type: ignore[attr-defined]
+            except Exception:
+                self._in_memory = True
+                self.pool = None
+        self._connected = True
+
+    def _ensure_flusher(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._flush_loop())
+
+    async def _flush_loop(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self._next_wait())
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            now = time.monotonic()
+            if now < self._retry_at:
+                continue
+            if len(self._buffer) < self.flush_size and not self._due():
+                continue
+            try:
+                await self.flush()
+            except Exception as exc:
+                self.last_error = exc
+                self._failures += 1
+                delay = min(self.backoff_base * 2 ** (self._failures - 1), self.max_backoff)
+                self._retry_at = time.monotonic() + delay
+            else:
+                self._failures = 0
+                self._retry_at = 0.0
+
+    def _next_wait(self) -> Optional[float]:
+        now = time.monotonic()
+        if self._retry_at > now:
+            return self._retry_at - now
+        if self._oldest is not None:
+            return max(self._oldest + self.flush_interval - now, 0.0)
+        return None
+
+    @property
+    def pending(self) -> int:
+        return len(self._buffer)
+
+    async def offer(
+        self,
+        *,
+        thread_id: str,
+        method: str,
+        params: Dict[str, Any],
+        translation: TranslationResult,
+    ) -> int:
+        """Buffer the patient-linked evidence of ``translation``.
+
+        Never waits on the database: writes happen in the background
+        flusher, which this only wakes. Returns the number of rows buffered.
+        """
+        rows = list(self._rows_for(thread_id, method, params, translation))
+        if not rows:
+            return 0
+        self._ensure_flusher()
+        was_empty = not self._buffer
+        added = 0
+        for row in rows:
+            if row[0] in self._buffered_ids:
+                continue
+            self._buffer.append(row)
+            self._buffered_ids.add(row[0])
+            added += 1
+        if self._oldest is None and self._buffer:
+            self._oldest = time.monotonic()
+        self._trim()
+        if was_empty or len(self._buffer) >= self.flush_size:
+            self._wakeup.set()
+        return added
+
+    def _due(self) -> bool:
+        return self._oldest is not None and time.monotonic() - self._oldest >= self.flush_interval
+
+    def _trim(self) -> None:
+        overflow = len(self._buffer) - self.max_buffer
+        if overflow > 0:
+            for row in self._buffer[:overflow]:
+                self._buffered_ids.discard(row[0])
+            del self._buffer[:overflow]
+            self.dropped += overflow
+
+    async def flush(self) -> int:
+        """Write all buffered rows; on failure they stay buffered and it raises."""
+        async with self._flush_lock:
+            if not self._buffer:
+                return 0
+            batch = self._buffer
+            self._buffer = []
+            self._buffered_ids = set()
+            self._oldest = None
+            try:
+                await self._write(batch)
+            except Exception:
+                self._buffer = batch + self._buffer
+                self._buffered_ids = {row[0] for row in self._buffer}
+                self._oldest = time.monotonic()
+                self._trim()
+                raise
+            return len(batch)
+
+    async def _write(self, batch: List[Tuple[Any, ...]]) -> None:
+        # Called under ``_flush_lock``; connects on first use if ``init`` was skipped.
+        await self._connect()
+        if self._in_memory or not self.pool or asyncpg is None:
+            for row in batch:
+                self._memory_rows.setdefault(row[0], row)
+            return
+
+        # COPY cannot skip conflicts, so stage the batch and merge it.
+        async with self.pool.acquire() as conn:  # type: ignore[union-attr]
+            async with conn.transaction():
+                await conn.execute(
+                    """
+                    CREATE TEMP TABLE IF NOT EXISTS integrated_analytics_stage
+                        (LIKE integrated_analytics INCLUDING DEFAULTS)
+                        ON COMMIT DELETE ROWS
+                    """
+                )
+                await conn.copy_records_to_table(
+                    "integrated_analytics_stage", records=batch, columns=COLUMNS
+                )
+                await conn.execute(
+                    f"""
+                    INSERT INTO integrated_analytics ({", ".join(COLUMNS)})
+                    SELECT {", ".join(f"s.{c}" for c in COLUMNS)}
+                      FROM integrated_analytics_stage s
+                     WHERE EXISTS (
+                        SELECT 1 FROM unified_patient_profiles p WHERE p.patient_id = s.patient_id
+                     )
+                    ON CONFLICT (analytics_id) DO NOTHING
+                    """
+                )
+
+    def _rows_for(
+        self,
+        thread_id: str,
+        method: str,
+        params: Dict[str, Any],
+        translation: TranslationResult,
+    ) -> Iterator[Tuple[Any, ...]]:
+        if not translation.success or not (translation.uir or "").startswith("evidence."):
+            return
+        namespace = UUID(thread_id)
+        default_patient = _as_uuid(params.get("patient_id"))
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+
+        for index, item in enumerate(translation.data.get("items", [])):
+            for patient_id, value in _split_by_patient(item, default_patient):
+                yield (
+                    uuid5(namespace, f"{index}:{patient_id}"),
+                    patient_id,
+                    self.module_source,
+                    f"{translation.uir}:{item.get('type', 'unknown')}"[:100],
+                    json.dumps(value),
+                    json.dumps(
+                        {
+                            "thread_id": thread_id,
+                            "method": method,
+                            "confidence": item.get("confidence"),
+                        }
+                    ),
+                    now,
+                )
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        try:
+            await self.flush()
+        except Exception as exc:
+            self.last_error = exc
+        finally:
+            if self.pool is not None:
+                await self.pool.close()
+                self.pool = None
+
+
+def _as_uuid(value: Any) -> Optional[UUID]:
+    if value is None:
+        return None
+    try:
+        return UUID(str(value))
+    except ValueError:
+        return None
+
+
+def _split_by_patient(
+    item: Dict[str, Any], default_patient: Optional[UUID]
+) -> Iterator[Tuple[UUID, Dict[str, Any]]]:
+    """Yield ``(patient_id, metric_value)`` pairs for one evidence item.
+
+    Table rows are grouped by their ``patient_id`` column; other items are
+    attributed to the request-level ``patient_id``, if any.
+    """
+    if item.get("type") == "table":
+        columns = item.get("columns", [])
+        grouped: Dict[UUID, List[Any]] = {}
+        for row in item.get("rows", []):
+            record = row if isinstance(row, dict) else dict(zip(columns, row))
+            patient_id = _as_uuid(record.get("patient_id")) or default_patient
+            if patient_id is not None:
+                grouped.setdefault(patient_id, []).append(row)
+        for patient_id, rows in grouped.items():
+            yield patient_id, {**item, "rows": rows}
+        return
+
+    if default_patient is not None:
+        yield default_patient, item
@@ -2,16 +2,25 @@
 from __future__ import annotations
 
 import asyncio
+import time
 from typing import Any, Dict, Optional
 
+from .analytics import AnalyticsSink
 from .translator import ProtocolTranslator
 from .store import BridgeStore, TxStatus
 from .crypto import sign_message
+from .keyring import KeyRing
+from .schemas import SchemaValidationError
 from .security import SecurityGateway, SecurityError
+from .wire import EncodedResponse, WireReply, encode_response
 
 
 class MCPAIPBridge:
-    """Main bridge coordinator."""
+    """Main bridge coordinator.
+
+    Responses (and their encoded bytes) are kept for replay for at most the
+    store's idempotency TTL and at most ``cache_size`` entries.
+    """
 
     def __init__(
         self,
@@ -20,12 +29,22 @@ class MCPAIPBridge:
         translator: Optional[ProtocolTranslator] = None,
         security: Optional[SecurityGateway] = None,
         signer_privkey_b64: Optional[str] = None,
+        keyring: Optional[KeyRing] = None,
+        compress_min_bytes: Optional[int] = 1024,
+        analytics_sink: Optional[AnalyticsSink] = None,
+        cache_size: int = 10000,
     ) -> None:
         self.store = store
         self.translator = translator or ProtocolTranslator()
         self.security = security
         self.signer_privkey_b64 = signer_privkey_b64
+        self.keyring = keyring
+        self.compress_min_bytes = compress_min_bytes
+        self.analytics_sink = analytics_sink
         self._response_cache: Dict[str, Dict[str, Any]] = {}
+        self._encoded_cache: Dict[str, EncodedResponse] = {}
+        self._cached_at: Dict[str, float] = {}
+        self.cache_size = cache_size
         self._lock = asyncio.Lock()
 
     async def handle_mcp_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
@@ -36,53 +55,116 @@ class MCPAIPBridge:
             raise ValueError("MCP request missing 'id'")
 
         async with self._lock:
-            cached = await self._lookup_cached_response(mcp_id)
-            if cached is not None:
-                return cached
-
-            method = request.get("method", "")
-            params = request.get("params", {})
-            thread_id = self.store.thread_for(method, mcp_id)
-
-            tx = await self.store.upsert_bridge_tx(
-                mcp_id=mcp_id,
-                thread_id=thread_id,
-                method=method,
-                status=TxStatus.QUEUED,
-            )
+            return await self._handle_locked(mcp_id, request)
 
-            if self.security:
-                await self._run_preflight(method, params)
-
-            translation = await self.translator.mcp_to_uir(method, params)
+    async def handle_mcp_request_encoded(
+        self,
+        request: Dict[str, Any],
+        *,
+        if_none_match: Optional[str] = None,
+        accept_gzip: bool = False,
+    ) -> WireReply:
+        """Handle a request and return wire bytes.
 
-            response = {
-                "id": mcp_id,
-                "thread_id": thread_id,
-                "success": translation.success,
-                "uir": translation.uir,
-                "data": translation.data,
-            }
-            if translation.error:
-                response["error"] = translation.error
+        The encoded body is cached per ``mcp_id`` so duplicate replays skip
+        JSON serialization entirely; a matching ``If-None-Match`` gets a 304.
+        """
 
-            if self.signer_privkey_b64:
-                response = sign_message(self.signer_privkey_b64, response)
+        mcp_id = request.get("id")
+        if not mcp_id:
+            raise ValueError("MCP request missing 'id'")
 
-            await self.store.update_bridge_tx(
-                tx_id=tx["id"],
-                status=TxStatus.ACKED,
-                aip_msg_id=response.get("id"),
+        async with self._lock:
+            response = await self._handle_locked(mcp_id, request)
+            encoded = self._encoded_cache.get(mcp_id)
+            if encoded is None:
+                encoded = encode_response(response, compress_min_bytes=self.compress_min_bytes)
+                if mcp_id in self._response_cache:
+                    self._encoded_cache[mcp_id] = encoded
+        return encoded.reply(if_none_match=if_none_match, accept_gzip=accept_gzip)
+
+    async def _handle_locked(self, mcp_id: str, request: Dict[str, Any]) -> Dict[str, Any]:
+        cached = await self._lookup_cached_response(mcp_id)
+        if cached is not None:
+            return cached
+
+        errors = self.translator.validate_mcp_request(request)
+        if errors:
+            raise SchemaValidationError(f"Invalid MCP request: {'; '.join(errors)}")
+
+        method = request.get("method", "")
+        params = request.get("params", {})
+        thread_id = self.store.thread_for(method, mcp_id)
+
+        tx = await self.store.upsert_bridge_tx(
+            mcp_id=mcp_id,
+            thread_id=thread_id,
+            method=method,
+            status=TxStatus.QUEUED,
+        )
+
+        if self.security:
+            await self._run_preflight(method, params)
+
+        translation = await self.translator.mcp_to_uir(method, params)
+
+        if self.analytics_sink:
+            await self.analytics_sink.offer(
+                thread_id=thread_id,
+                method=method,
+                params=params,
+                translation=translation,
             )
 
-            self._response_cache[mcp_id] = response
-            return response
+        response = {
+            "id": mcp_id,
+            "thread_id": thread_id,
+            "success": translation.success,
+            "uir": translation.uir,
+            "data": translation.data,
+        }
+        if translation.error:
+            response["error"] = translation.error
+
+        if self.keyring:
+            self.keyring.maybe_rotate()
+            response = self.keyring.sign(response)
+        elif self.signer_privkey_b64:
+            response = sign_message(self.signer_privkey_b64, response)
+
+        await self.store.update_bridge_tx(
+            tx_id=tx["id"],
+            status=TxStatus.ACKED,
+            aip_msg_id=response.get("id"),
+        )
+
+        self._remember(mcp_id, response)
+        return response
 
     async def _lookup_cached_response(self, mcp_id: str) -> Optional[Dict[str, Any]]:
         duplicate = await self.store.check_duplicate(mcp_id)
-        if duplicate and mcp_id in self._response_cache:
-            return self._response_cache[mcp_id]
-        return None
+        if not duplicate:
+            self._forget(mcp_id)
+            return None
+        return self._response_cache.get(mcp_id)
+
+    def _remember(self, mcp_id: str, response: Dict[str, Any]) -> None:
+        now = time.monotonic()
+        cutoff = now - self.store.retention.total_seconds()
+        # ``_cached_at`` is in insertion order, so expired entries lead.
+        while self._cached_at:
+            old_id, cached_at = next(iter(self._cached_at.items()))
+            if cached_at >= cutoff and len(self._cached_at) < self.cache_size:
+                break
+            self._forget(old_id)
+        self._forget(mcp_id)
+        self._cached_at[mcp_id] = now
+        self._response_cache[mcp_id] = response
+
+    def _forget(self, mcp_id: str) -> None:
+        self._cached_at.pop(mcp_id, None)
+        self._response_cache.pop(mcp_id, None)
+        self._encoded_cache.pop(mcp_id, None)
 
     async def _run_preflight(self, method: str, params: Dict[str, Any]) -> None:
         if not self.security:
@@ -93,5 +175,11 @@ class MCPAIPBridge:
             raise
 
     async def close(self) -> None:
-        if self.security and hasattr(self.security, "aclose"):
-            await self.security.aclose()
+        """Close the analytics sink, the security client and the store."""
+        try:
+            if self.analytics_sink:
+                await self.analytics_sink.close()
+            if self.security and hasattr(self.security, "aclose"):
+                await self.security.aclose()
+        finally:
+            await self.store.close()
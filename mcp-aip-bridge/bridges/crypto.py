@@ -3,11 +3,13 @@ from __future__ import annotations
 
 import hashlib
 import json
-from typing import Any, Dict
+from typing import Any, Dict, Union
 
 from nacl.encoding import Base64Encoder
 from nacl.signing import SigningKey, VerifyKey
 
+DEFAULT_SIG_KEY_ID = "bridge-ed25519-v1"
+
 
 def canonical_json(obj: Dict[str, Any]) -> bytes:
     """RFC 8785 canonical JSON serialization."""
@@ -24,26 +26,37 @@ def content_hash(msg: Dict[str, Any]) -> str:
     return hashlib.sha256(canonical_json(subset)).hexdigest()
 
 
-def sign_message(privkey_b64: str, msg: Dict[str, Any]) -> Dict[str, Any]:
-    """Sign AIP message with Ed25519."""
-    signer = SigningKey(privkey_b64, encoder=Base64Encoder)
-    digest = content_hash(msg).encode()
-    sig = signer.sign(digest).signature
+def sign_message(
+    privkey: Union[str, SigningKey],
+    msg: Dict[str, Any],
+    *,
+    sig_key_id: str = DEFAULT_SIG_KEY_ID,
+) -> Dict[str, Any]:
+    """Sign AIP message with Ed25519.
+
+    ``privkey`` may be a base64 seed or an already parsed ``SigningKey``.
+    """
+    signer = privkey if isinstance(privkey, SigningKey) else SigningKey(privkey, encoder=Base64Encoder)
+    digest = content_hash(msg)
+    sig = signer.sign(digest.encode()).signature
 
     msg.setdefault("trust", {})["signature"] = Base64Encoder.encode(sig).decode()
-    msg["trust"]["sig_key_id"] = "bridge-ed25519-v1"
-    msg["trust"]["content_hash"] = content_hash(msg)
+    msg["trust"]["sig_key_id"] = sig_key_id
+    msg["trust"]["content_hash"] = digest
 
     return msg
 
 
-def verify_signature(pubkey_b64: str, msg: Dict[str, Any]) -> bool:
-    """Verify message signature."""
-    verifier = VerifyKey(pubkey_b64, encoder=Base64Encoder)
-    sig = Base64Encoder.decode(msg["trust"]["signature"])
+def verify_signature(pubkey: Union[str, VerifyKey], msg: Dict[str, Any]) -> bool:
+    """Verify message signature.
+
+    ``pubkey`` may be a base64 public key or an already parsed ``VerifyKey``.
+    """
+    verifier = pubkey if isinstance(pubkey, VerifyKey) else VerifyKey(pubkey, encoder=Base64Encoder)
     digest = content_hash(msg).encode()
 
     try:
+        sig = Base64Encoder.decode(msg["trust"]["signature"])
         verifier.verify(digest, sig)
         return True
     except Exception:
@@ -0,0 +1,324 @@
+"""Thread-affine sharding of MCP requests across bridge workers."""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import inspect
+import multiprocessing
+import os
+from bisect import bisect
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from .core import MCPAIPBridge
+
+_STOP = object()
+
+BridgeFactory = Callable[[str], Union[MCPAIPBridge, Awaitable[MCPAIPBridge]]]
+
+# Per-process state of a shard worker process (see ``_ProcessWorker``).
+_CHILD_LOOP: Optional[asyncio.AbstractEventLoop] = None
+_CHILD_BRIDGE: Optional[MCPAIPBridge] = None
+
+
+def _child_init(factory: BridgeFactory, name: str) -> None:
+    global _CHILD_LOOP, _CHILD_BRIDGE
+    _CHILD_LOOP = asyncio.new_event_loop()
+    asyncio.set_event_loop(_CHILD_LOOP)
+    bridge = factory(name)
+    if inspect.isawaitable(bridge):
+        bridge = _CHILD_LOOP.run_until_complete(bridge)
+    _CHILD_BRIDGE = bridge
+
+
+def _child_handle(request: Dict[str, Any]) -> Dict[str, Any]:
+    assert _CHILD_LOOP is not None and _CHILD_BRIDGE is not None
+    return _CHILD_LOOP.run_until_complete(_CHILD_BRIDGE.handle_mcp_request(request))
+
+
+def _child_close() -> None:
+    if _CHILD_LOOP is not None and _CHILD_BRIDGE is not None:
+        _CHILD_LOOP.run_until_complete(_CHILD_BRIDGE.close())
+
+
+def _child_pid() -> int:
+    return os.getpid()
+
+
+def _hash(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """Consistent hash ring with virtual nodes.
+
+    Adding a node only moves the keys that land on its virtual points,
+    roughly ``1 / len(nodes)`` of the key space.
+    """
+
+    def __init__(self, nodes: Iterable[str] = (), *, replicas: int = 64) -> None:
+        self.replicas = replicas
+        self._points: List[int] = []
+        self._owners: List[str] = []
+        self._nodes: set = set()
+        for node in nodes:
+            self.add(node)
+
+    @property
+    def nodes(self) -> List[str]:
+        return sorted(self._nodes)
+
+    def add(self, node: str) -> None:
+        if node in self._nodes:
+            return
+        self._nodes.add(node)
+        self._rebuild()
+
+    def remove(self, node: str) -> None:
+        if node not in self._nodes:
+            return
+        self._nodes.discard(node)
+        self._rebuild()
+
+    def _rebuild(self) -> None:
+        ring: List[Tuple[int, str]] = sorted(
+            (_hash(f"{node}#{i}"), node) for node in self._nodes for i in range(self.replicas)
+        )
+        self._points = [point for point, _ in ring]
+        self._owners = [owner for _, owner in ring]
+
+    def lookup(self, key: str) -> str:
+        if not self._points:
+            raise LookupError("Hash ring has no nodes")
+        index = bisect(self._points, _hash(key)) % len(self._points)
+        return self._owners[index]
+
+
+def shard_by_mcp_id(request: Dict[str, Any]) -> str:
+    """Default shard key: duplicates of an ``mcp_id`` share a worker."""
+    mcp_id = request.get("id")
+    if not mcp_id:
+        raise ValueError("MCP request missing 'id'")
+    return str(mcp_id)
+
+
+class _Worker:
+    """Runs one shard's queue in FIFO order on this event loop."""
+
+    def __init__(self, name: str, bridge: Optional[MCPAIPBridge]) -> None:
+        self.name = name
+        self.bridge = bridge
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.task: Optional[asyncio.Task] = None
+
+    async def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        assert self.bridge is not None
+        return await self.bridge.handle_mcp_request(request)
+
+    async def pid(self) -> int:
+        return os.getpid()
+
+    async def aclose(self) -> None:
+        if self.bridge is not None:
+            await self.bridge.close()
+
+    async def run(self) -> None:
+        while True:
+            item = await self.queue.get()
+            try:
+                if item is _STOP:
+                    return
+                request, future, on_done = item
+                try:
+                    result = await self.handle(request)
+                except Exception as exc:
+                    if not future.cancelled():
+                        future.set_exception(exc)
+                else:
+                    if not future.cancelled():
+                        future.set_result(result)
+                finally:
+                    on_done()
+            finally:
+                self.queue.task_done()
+
+
+class _ProcessWorker(_Worker):
+    """Shard backed by a dedicated single-process pool.
+
+    The child builds its own bridge from the factory and keeps one event
+    loop, so the shard's response cache lives in that process and its
+    signing/hashing runs on its own core. The parent queue still feeds it
+    one request at a time, preserving per-key order.
+
+    If the child dies, the call in flight fails with ``BrokenProcessPool``
+    and the pool is replaced, so the next request on this shard starts a
+    fresh child with a new bridge from the factory.
+    """
+
+    def __init__(self, name: str, factory: BridgeFactory, mp_context: str) -> None:
+        super().__init__(name, None)
+        self.factory = factory
+        self.mp_context = mp_context
+        self.executor = self._new_executor()
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=multiprocessing.get_context(self.mp_context),
+            initializer=_child_init,
+            initargs=(self.factory, self.name),
+        )
+
+    async def _call(self, fn: Callable[..., Any], *args: Any) -> Any:
+        executor = self.executor
+        try:
+            return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+        except BrokenProcessPool:
+            if self.executor is executor:
+                executor.shutdown(wait=False)
+                self.executor = self._new_executor()
+            raise
+
+    async def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        return await self._call(_child_handle, request)
+
+    async def pid(self) -> int:
+        return await self._call(_child_pid)
+
+    async def aclose(self) -> None:
+        try:
+            await self._call(_child_close)
+        finally:
+            await asyncio.get_running_loop().run_in_executor(None, self.executor.shutdown)
+
+
+class ShardedDispatcher:
+    """Route requests to per-worker bridges by consistent hash of a shard key.
+
+    Each worker owns its own ``MCPAIPBridge`` (and therefore its own response
+    cache) and processes its queue in FIFO order, so requests sharing a shard
+    key are handled in arrival order by a single worker. While a key still has
+    work queued on a worker it stays pinned there, which keeps ordering intact
+    across ``add_worker``/``remove_worker`` rebalances.
+
+    With ``processes=True`` each worker is a separate process, so CPU-bound
+    signing and hashing spread across cores. The factory (which may be
+    async) is then pickled to the child and must be a module-level callable.
+    """
+
+    def __init__(
+        self,
+        bridge_factory: BridgeFactory,
+        *,
+        workers: int = 4,
+        replicas: int = 64,
+        shard_key: Callable[[Dict[str, Any]], str] = shard_by_mcp_id,
+        processes: bool = False,
+        mp_context: str = "spawn",
+    ) -> None:
+        if workers < 1:
+            raise ValueError("workers must be >= 1")
+        self.bridge_factory = bridge_factory
+        self.shard_key = shard_key
+        self.processes = processes
+        self.mp_context = mp_context
+        self.ring = HashRing(replicas=replicas)
+        self._workers: Dict[str, _Worker] = {}
+        self._pinned: Dict[str, Tuple[str, int]] = {}
+        self._initial_workers = workers
+        self._next_index = 0
+        self._started = False
+
+    @property
+    def worker_names(self) -> List[str]:
+        return list(self._workers)
+
+    def bridge_for(self, name: str) -> MCPAIPBridge:
+        bridge = self._workers[name].bridge
+        if bridge is None:
+            raise LookupError(f"Worker {name} runs its bridge in a separate process")
+        return bridge
+
+    async def worker_pid(self, name: str) -> int:
+        return await self._workers[name].pid()
+
+    async def start(self) -> None:
+        if self._started:
+            return
+        self._started = True
+        for _ in range(self._initial_workers):
+            await self.add_worker()
+
+    async def add_worker(self, name: Optional[str] = None) -> str:
+        if name is None:
+            name = f"worker-{self._next_index}"
+            self._next_index += 1
+        if name in self._workers:
+            raise ValueError(f"Worker {name} already registered")
+        if self.processes:
+            worker: _Worker = _ProcessWorker(name, self.bridge_factory, self.mp_context)
+        else:
+            bridge = self.bridge_factory(name)
+            if inspect.isawaitable(bridge):
+                bridge = await bridge
+            worker = _Worker(name, bridge)
+        worker.task = asyncio.create_task(worker.run())
+        self._workers[name] = worker
+        self.ring.add(name)
+        return name
+
+    async def remove_worker(self, name: str) -> None:
+        """Stop routing new keys to ``name`` and retire it once drained."""
+        worker = self._workers.get(name)
+        if worker is None:
+            raise KeyError(f"Worker {name} not found")
+        if len(self._workers) == 1:
+            raise ValueError("Cannot remove the last worker")
+        self.ring.remove(name)
+        await worker.queue.join()
+        await self._stop(worker)
+        del self._workers[name]
+
+    def worker_for(self, request: Dict[str, Any]) -> str:
+        return self._route(self.shard_key(request))
+
+    def _route(self, key: str) -> str:
+        pinned = self._pinned.get(key)
+        if pinned is not None:
+            return pinned[0]
+        return self.ring.lookup(key)
+
+    async def dispatch(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Enqueue ``request`` on its shard and await the bridge response."""
+        if not self._started:
+            await self.start()
+        key = self.shard_key(request)
+        name = self._route(key)
+        _, pending = self._pinned.get(key, (name, 0))
+        self._pinned[key] = (name, pending + 1)
+
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        await self._workers[name].queue.put((request, future, lambda: self._release(key)))
+        return await future
+
+    def _release(self, key: str) -> None:
+        name, pending = self._pinned[key]
+        if pending <= 1:
+            del self._pinned[key]
+        else:
+            self._pinned[key] = (name, pending - 1)
+
+    async def _stop(self, worker: _Worker) -> None:
+        await worker.queue.put(_STOP)
+        if worker.task is not None:
+            await worker.task
+        await worker.aclose()
+
+    async def close(self) -> None:
+        for name, worker in list(self._workers.items()):
+            self.ring.remove(name)
+            await self._stop(worker)
+        self._workers.clear()
+        self._started = False
@@ -0,0 +1,336 @@
+"""Ed25519 key ring with scheduled rotation and cached verifiers."""
+from __future__ import annotations
+
+import os
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Union
+
+from nacl.encoding import Base64Encoder
+from nacl.signing import SigningKey, VerifyKey
+
+from .crypto import DEFAULT_SIG_KEY_ID, sign_message, verify_signature
+
+PRIVATE_KEY_SUFFIX = ".key"
+PUBLIC_KEY_SUFFIX = ".pub"
+ENV_SINGLE_KEY = "ED25519_PRIVKEY_B64"
+ENV_KEY_LIST = "BRIDGE_SIGNING_KEYS"
+
+
+class KeyRingError(RuntimeError):
+    """Raised when the key ring cannot sign or resolve a key."""
+
+
+@dataclass
+class KeyEntry:
+    key_id: str
+    verify_key: VerifyKey
+    created_at: datetime
+    signing_key: Optional[SigningKey] = None
+    retired_at: Optional[datetime] = None
+
+    @property
+    def can_sign(self) -> bool:
+        return self.signing_key is not None
+
+
+class KeyRing:
+    """Holds signing keys by ``sig_key_id`` and rotates the active one.
+
+    A signing key becomes eligible at its ``created_at``; keys dated in the
+    future are staged: their verifiers are cached (and, for directory rings,
+    published to every process sharing the directory) before any message is
+    signed with them, so switching the active id never produces signatures
+    that peers cannot verify. Retired keys stay verifiable for
+    ``retain_days``; once pruned they are not loaded from ``key_dir`` again.
+
+    When no staged key is due and the active key is older than
+    ``rotation_days``, a ring backed by ``key_dir`` generates a key and writes
+    ``<id>.pub``/``<id>.key`` there before switching. Rings without a
+    directory never invent keys; they keep signing with the current one.
+
+    Verifying a message with an unknown ``sig_key_id`` rescans ``key_dir``
+    at most once per ``reload_interval`` seconds, and keys found that way
+    are only registered: the active signing key changes only in
+    ``maybe_rotate`` or ``rotate``.
+    """
+
+    def __init__(
+        self,
+        *,
+        rotation_days: int = 30,
+        retain_days: Optional[int] = None,
+        key_prefix: str = "bridge-ed25519",
+        key_dir: Optional[Union[str, os.PathLike]] = None,
+        clock: Optional[Callable[[], datetime]] = None,
+        reload_interval: float = 5.0,
+    ) -> None:
+        self.rotation_interval = timedelta(days=rotation_days)
+        self.retain_interval = timedelta(days=retain_days if retain_days is not None else rotation_days)
+        self.key_prefix = key_prefix
+        self.key_dir = Path(key_dir) if key_dir is not None else None
+        self.reload_interval = timedelta(seconds=reload_interval)
+        self._clock = clock or (lambda: datetime.now(timezone.utc))
+        self._keys: Dict[str, KeyEntry] = {}
+        self._active_id: Optional[str] = None
+        self._next_activation: Optional[datetime] = None
+        self._last_reload: Optional[datetime] = None
+        self._pruned: set = set()
+        self._lock = threading.RLock()
+
+    # ------------------------------------------------------------------ loading
+    @classmethod
+    def from_directory(cls, path: Union[str, os.PathLike], **kwargs: Any) -> "KeyRing":
+        """Load ``<key_id>.key`` (base64 seed) and ``<key_id>.pub`` files.
+
+        A key's activation time is the file's mtime, so the newest signing
+        key becomes active; give a key a future mtime to stage it.
+        """
+        ring = cls(key_dir=path, **kwargs)
+        ring.reload()
+        with ring._lock:
+            ring._select_active(ring._clock())
+        return ring
+
+    def reload(self) -> List[str]:
+        """Register keys added to ``key_dir`` since the last load.
+
+        Does not change the active key. Returns the ids of newly registered
+        keys; keys this ring has pruned are skipped.
+        """
+        if self.key_dir is None:
+            return []
+        self._last_reload = self._clock()
+        added: List[str] = []
+        for key_file in sorted(self.key_dir.glob(f"*{PRIVATE_KEY_SUFFIX}")):
+            if key_file.stem in self._keys or key_file.stem in self._pruned:
+                continue
+            created_at = datetime.fromtimestamp(key_file.stat().st_mtime, timezone.utc)
+            self.add_signing_key(key_file.stem, key_file.read_text().strip(), created_at=created_at, activate=False)
+            added.append(key_file.stem)
+        for pub_file in sorted(self.key_dir.glob(f"*{PUBLIC_KEY_SUFFIX}")):
+            if pub_file.stem in self._keys or pub_file.stem in self._pruned:
+                continue
+            created_at = datetime.fromtimestamp(pub_file.stat().st_mtime, timezone.utc)
+            self.add_verify_key(pub_file.stem, pub_file.read_text().strip(), created_at=created_at)
+            added.append(pub_file.stem)
+        return added
+
+    @classmethod
+    def from_env(cls, environ: Optional[Mapping[str, str]] = None, **kwargs: Any) -> "KeyRing":
+        """Load keys from ``BRIDGE_SIGNING_KEYS`` and ``ED25519_PRIVKEY_B64``.
+
+        ``BRIDGE_SIGNING_KEYS`` is a comma separated list of
+        ``<key_id>:<base64 seed>[:<ISO activation time>]`` entries, oldest
+        first; entries with a future activation time are staged. The legacy
+        single key variable is registered under the default ``sig_key_id``.
+        """
+        env = os.environ if environ is None else environ
+        ring = cls(**kwargs)
+        now = ring._clock()
+        single = env.get(ENV_SINGLE_KEY)
+        if single:
+            ring.add_signing_key(DEFAULT_SIG_KEY_ID, single, created_at=now - timedelta(microseconds=1))
+        entries = [item.strip() for item in env.get(ENV_KEY_LIST, "").split(",") if item.strip()]
+        for offset, item in enumerate(entries):
+            key_id, _, rest = item.partition(":")
+            seed, _, activate_at = rest.partition(":")
+            if not key_id or not seed:
+                raise KeyRingError(f"Malformed {ENV_KEY_LIST} entry: {key_id or item!r}")
+            try:
+                created_at = (
+                    datetime.fromisoformat(activate_at)
+                    if activate_at
+                    else now + timedelta(microseconds=offset)
+                )
+            except ValueError:
+                raise KeyRingError(f"Malformed activation time for {key_id}") from None
+            if created_at.tzinfo is None:
+                created_at = created_at.replace(tzinfo=timezone.utc)
+            ring.add_signing_key(key_id, seed, created_at=created_at)
+        return ring
+
+    def add_signing_key(
+        self,
+        key_id: str,
+        privkey: Union[str, SigningKey],
+        *,
+        created_at: Optional[datetime] = None,
+        activate: bool = True,
+    ) -> KeyEntry:
+        signer = privkey if isinstance(privkey, SigningKey) else SigningKey(privkey, encoder=Base64Encoder)
+        entry = KeyEntry(
+            key_id=key_id,
+            verify_key=signer.verify_key,
+            created_at=created_at or self._clock(),
+            signing_key=signer,
+        )
+        with self._lock:
+            self._keys[key_id] = entry
+            if activate:
+                self._select_active(self._clock())
+        return entry
+
+    def add_verify_key(
+        self,
+        key_id: str,
+        pubkey: Union[str, VerifyKey],
+        *,
+        created_at: Optional[datetime] = None,
+    ) -> KeyEntry:
+        verifier = pubkey if isinstance(pubkey, VerifyKey) else VerifyKey(pubkey, encoder=Base64Encoder)
+        entry = KeyEntry(key_id=key_id, verify_key=verifier, created_at=created_at or self._clock())
+        with self._lock:
+            self._keys[key_id] = entry
+        return entry
+
+    def _select_active(self, now: datetime) -> None:
+        signers = [k for k in self._keys.values() if k.can_sign and k.retired_at is None]
+        due = [k for k in signers if k.created_at <= now]
+        staged = [k.created_at for k in signers if k.created_at > now]
+        self._next_activation = min(staged) if staged else None
+        if not due:
+            self._active_id = None
+            return
+        newest = max(due, key=lambda k: k.created_at)
+        self._active_id = newest.key_id
+        for entry in due:
+            if entry is not newest:
+                entry.retired_at = now
+
+    # ----------------------------------------------------------------- rotation
+    @property
+    def active_key_id(self) -> Optional[str]:
+        return self._active_id
+
+    def key_ids(self) -> List[str]:
+        return list(self._keys)
+
+    def needs_rotation(self, now: Optional[datetime] = None) -> bool:
+        now = now or self._clock()
+        if self._next_activation is not None and self._next_activation <= now:
+            return True
+        active = self._keys.get(self._active_id) if self._active_id else None
+        if active is None:
+            return True
+        return now - active.created_at >= self.rotation_interval
+
+    def rotate(self, *, new_key: Optional[SigningKey] = None, key_id: Optional[str] = None) -> KeyEntry:
+        """Make a new signing key active.
+
+        Without ``new_key`` the ring generates one, which requires
+        ``key_dir``: the key is written there (public half first) before it
+        becomes active so that other processes and restarts can use it. The
+        previous key stays in the ring as verify-only until it ages past the
+        retention window.
+        """
+        now = self._clock()
+        key_id = key_id or f"{self.key_prefix}-{now.strftime('%Y%m%dT%H%M%S%f')}"
+        if new_key is None:
+            if self.key_dir is None:
+                raise KeyRingError("Generating a signing key requires key_dir")
+            new_key = SigningKey.generate()
+            self._persist(key_id, new_key, now)
+        entry = self.add_signing_key(key_id, new_key, created_at=now)
+        self.prune(now)
+        return entry
+
+    def maybe_rotate(self, now: Optional[datetime] = None) -> Optional[KeyEntry]:
+        """Activate a due staged key, or rotate once the active key expires.
+
+        Returns the newly active entry, or ``None`` when nothing changed.
+        """
+        now = now or self._clock()
+        if not self.needs_rotation(now):
+            return None
+        with self._lock:
+            previous = self._active_id
+            self.reload()
+            self._select_active(now)
+            if self._active_id is not None and self._active_id != previous:
+                self.prune(now)
+                return self._keys[self._active_id]
+            if self.key_dir is None or not self.needs_rotation(now):
+                return None
+            return self.rotate()
+
+    def _persist(self, key_id: str, signer: SigningKey, created_at: datetime) -> None:
+        assert self.key_dir is not None
+        self.key_dir.mkdir(parents=True, exist_ok=True)
+        pub = signer.verify_key.encode(encoder=Base64Encoder).decode()
+        seed = signer.encode(encoder=Base64Encoder).decode()
+        for suffix, content, mode in ((PUBLIC_KEY_SUFFIX, pub, 0o644), (PRIVATE_KEY_SUFFIX, seed, 0o600)):
+            target = self.key_dir / f"{key_id}{suffix}"
+            tmp = target.with_name(f".{target.name}.tmp")
+            fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+            with os.fdopen(fd, "w") as f:
+                f.write(content)
+            # mtime is the activation time read back by ``reload``.
+            os.utime(tmp, (created_at.timestamp(), created_at.timestamp()))
+            os.replace(tmp, target)
+
+    def prune(self, now: Optional[datetime] = None) -> List[str]:
+        """Drop retired keys whose retention window has passed."""
+        now = now or self._clock()
+        removed: List[str] = []
+        with self._lock:
+            for key_id, entry in list(self._keys.items()):
+                if entry.retired_at and now - entry.retired_at >= self.retain_interval:
+                    del self._keys[key_id]
+                    self._pruned.add(key_id)
+                    removed.append(key_id)
+        return removed
+
+    # ------------------------------------------------------------ sign / verify
+    def verifier(self, key_id: str) -> Optional[VerifyKey]:
+        entry = self._keys.get(key_id)
+        if entry is None and key_id and self.key_dir is not None and key_id not in self._pruned:
+            # A peer may have published a key after our last load; rescans are
+            # rate limited because the id comes from the inbound message.
+            now = self._clock()
+            if self._last_reload is None or now - self._last_reload >= self.reload_interval:
+                with self._lock:
+                    self.reload()
+                entry = self._keys.get(key_id)
+        return entry.verify_key if entry else None
+
+    def public_key_b64(self, key_id: str) -> Optional[str]:
+        verifier = self.verifier(key_id)
+        return verifier.encode(encoder=Base64Encoder).decode() if verifier else None
+
+    def sign(self, msg: Dict[str, Any]) -> Dict[str, Any]:
+        key_id = self._active_id
+        entry = self._keys.get(key_id) if key_id else None
+        if entry is None or entry.signing_key is None:
+            raise KeyRingError("No active signing key")
+        return sign_message(entry.signing_key, msg, sig_key_id=entry.key_id)
+
+    def verify(self, msg: Dict[str, Any]) -> bool:
+        return self.verify_many([msg])[0]
+
+    def verify_many(self, messages: Iterable[Dict[str, Any]]) -> List[bool]:
+        """Verify inbound AIP messages, resolving each ``sig_key_id`` once.
+
+        Results are returned in input order; malformed messages verify as
+        ``False`` without affecting the rest of the batch.
+        """
+        batch = list(messages)
+        groups: Dict[str, List[int]] = {}
+        for index, msg in enumerate(batch):
+            trust = msg.get("trust") if isinstance(msg, dict) else None
+            if not isinstance(trust, dict) or "signature" not in trust:
+                continue
+            key_id = trust.get("sig_key_id")
+            if isinstance(key_id, str):
+                groups.setdefault(key_id, []).append(index)
+
+        results = [False] * len(batch)
+        for key_id, indices in groups.items():
+            verifier = self.verifier(key_id)
+            if verifier is None:
+                continue
+            for index in indices:
+                results[index] = verify_signature(verifier, batch[index])
+        return results
@@ -0,0 +1,209 @@
+"""JSON Schema validators compiled once per schema and cached by schema id."""
+from __future__ import annotations
+
+import json
+import re
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+SCHEMA_ROOT = Path(__file__).resolve().parent.parent / "schemas"
+DEFAULT_SCHEMA_DIRS = (SCHEMA_ROOT / "mcp", SCHEMA_ROOT / "aip")
+
+# (instance, path, errors) -> None; appends one message per violation.
+Check = Callable[[Any, str, List[str]], None]
+
+_ANNOTATIONS = {"$id", "$schema", "$comment", "title", "description", "default", "examples"}
+
+_TYPE_CHECKS: Dict[str, Callable[[Any], bool]] = {
+    "object": lambda v: isinstance(v, dict),
+    "array": lambda v: isinstance(v, list),
+    "string": lambda v: isinstance(v, str),
+    "integer": lambda v: isinstance(v, int) and not isinstance(v, bool),
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "boolean": lambda v: isinstance(v, bool),
+    "null": lambda v: v is None,
+}
+
+
+class SchemaCompileError(ValueError):
+    """Raised when a schema uses keywords the compiler does not support."""
+
+
+class SchemaValidationError(ValueError):
+    """Raised when a message fails validation against its schema."""
+
+
+class CompiledValidator:
+    """A schema compiled into a tree of closures."""
+
+    def __init__(self, schema_id: str, schema: Dict[str, Any]) -> None:
+        self.schema_id = schema_id
+        self.schema = schema
+        self._check = compile_schema(schema)
+
+    def errors(self, instance: Any) -> List[str]:
+        found: List[str] = []
+        self._check(instance, "$", found)
+        return found
+
+    def is_valid(self, instance: Any) -> bool:
+        return not self.errors(instance)
+
+
+def compile_schema(schema: Union[Dict[str, Any], bool]) -> Check:
+    """Compile a JSON Schema subset into a single check function.
+
+    Supports ``type``, ``enum``, ``const``, ``properties``, ``required``,
+    ``additionalProperties``, ``items``, ``minItems``, ``minLength``,
+    ``maxLength``, ``pattern``, ``minimum`` and ``maximum``.
+    """
+    if schema is True:
+        return lambda instance, path, errors: None
+    if schema is False:
+        return lambda instance, path, errors: errors.append(f"{path}: not allowed")
+
+    unknown = set(schema) - _ANNOTATIONS - {
+        "type", "enum", "const", "properties", "required", "additionalProperties",
+        "items", "minItems", "minLength", "maxLength", "pattern", "minimum", "maximum",
+    }
+    if unknown:
+        raise SchemaCompileError(f"Unsupported schema keywords: {sorted(unknown)}")
+
+    checks: List[Check] = []
+
+    if "type" in schema:
+        names = schema["type"] if isinstance(schema["type"], list) else [schema["type"]]
+        predicates = [_TYPE_CHECKS[name] for name in names]
+        expected = "|".join(names)
+
+        def check_type(instance: Any, path: str, errors: List[str]) -> None:
+            if not any(predicate(instance) for predicate in predicates):
+                errors.append(f"{path}: expected {expected}")
+
+        checks.append(check_type)
+
+    if "enum" in schema:
+        allowed = list(schema["enum"])
+
+        def check_enum(instance: Any, path: str, errors: List[str]) -> None:
+            if instance not in allowed:
+                errors.append(f"{path}: {instance!r} not in {allowed}")
+
+        checks.append(check_enum)
+
+    if "const" in schema:
+        const = schema["const"]
+
+        def check_const(instance: Any, path: str, errors: List[str]) -> None:
+            if instance != const:
+                errors.append(f"{path}: expected {const!r}")
+
+        checks.append(check_const)
+
+    if "required" in schema or "properties" in schema or "additionalProperties" in schema:
+        required = list(schema.get("required", []))
+        properties = {name: compile_schema(sub) for name, sub in schema.get("properties", {}).items()}
+        additional = schema.get("additionalProperties", True)
+        additional_check = None if additional is True else compile_schema(additional)
+
+        def check_object(instance: Any, path: str, errors: List[str]) -> None:
+            if not isinstance(instance, dict):
+                return
+            for name in required:
+                if name not in instance:
+                    errors.append(f"{path}: missing required property {name!r}")
+            for name, value in instance.items():
+                sub = properties.get(name, additional_check)
+                if sub is not None:
+                    sub(value, f"{path}.{name}", errors)
+
+        checks.append(check_object)
+
+    if "items" in schema or "minItems" in schema:
+        item_check = compile_schema(schema["items"]) if "items" in schema else None
+        min_items = schema.get("minItems")
+
+        def check_array(instance: Any, path: str, errors: List[str]) -> None:
+            if not isinstance(instance, list):
+                return
+            if min_items is not None and len(instance) < min_items:
+                errors.append(f"{path}: expected at least {min_items} items")
+            if item_check is not None:
+                for index, item in enumerate(instance):
+                    item_check(item, f"{path}[{index}]", errors)
+
+        checks.append(check_array)
+
+    if "minLength" in schema or "maxLength" in schema or "pattern" in schema:
+        min_length = schema.get("minLength")
+        max_length = schema.get("maxLength")
+        pattern = re.compile(schema["pattern"]) if "pattern" in schema else None
+
+        def check_string(instance: Any, path: str, errors: List[str]) -> None:
+            if not isinstance(instance, str):
+                return
+            if min_length is not None and len(instance) < min_length:
+                errors.append(f"{path}: shorter than {min_length}")
+            if max_length is not None and len(instance) > max_length:
+                errors.append(f"{path}: longer than {max_length}")
+            if pattern is not None and not pattern.search(instance):
+                errors.append(f"{path}: does not match {pattern.pattern!r}")
+
+        checks.append(check_string)
+
+    if "minimum" in schema or "maximum" in schema:
+        minimum = schema.get("minimum")
+        maximum = schema.get("maximum")
+
+        def check_number(instance: Any, path: str, errors: List[str]) -> None:
+            if not _TYPE_CHECKS["number"](instance):
+                return
+            if minimum is not None and instance < minimum:
+                errors.append(f"{path}: below minimum {minimum}")
+            if maximum is not None and instance > maximum:
+                errors.append(f"{path}: above maximum {maximum}")
+
+        checks.append(check_number)
+
+    if len(checks) == 1:
+        return checks[0]
+
+    def check_all(instance: Any, path: str, errors: List[str]) -> None:
+        for check in checks:
+            check(instance, path, errors)
+
+    return check_all
+
+
+class SchemaRegistry:
+    """Loads ``*.json`` schemas and keeps one compiled validator per ``$id``."""
+
+    def __init__(self, schema_dirs: Optional[Iterable[Union[str, Path]]] = None) -> None:
+        self._validators: Dict[str, CompiledValidator] = {}
+        for directory in DEFAULT_SCHEMA_DIRS if schema_dirs is None else schema_dirs:
+            self.load_directory(directory)
+
+    @property
+    def schema_ids(self) -> List[str]:
+        return sorted(self._validators)
+
+    def load_directory(self, directory: Union[str, Path]) -> None:
+        for schema_file in sorted(Path(directory).glob("*.json")):
+            with open(schema_file, "r", encoding="utf-8") as f:
+                schema = json.load(f)
+            self.register(schema, schema_id=schema.get("$id", schema_file.stem))
+
+    def register(self, schema: Dict[str, Any], *, schema_id: Optional[str] = None) -> CompiledValidator:
+        schema_id = schema_id or schema["$id"]
+        validator = CompiledValidator(schema_id, schema)
+        self._validators[schema_id] = validator
+        return validator
+
+    def validator(self, schema_id: str) -> CompiledValidator:
+        try:
+            return self._validators[schema_id]
+        except KeyError:
+            raise KeyError(f"Unknown schema {schema_id}") from None
+
+    def validate(self, schema_id: str, instance: Any) -> List[str]:
+        return self.validator(schema_id).errors(instance)
@@ -3,9 +3,10 @@
 from __future__ import annotations
 
 import asyncio
-from datetime import datetime, timezone
+import re
+from datetime import datetime, timedelta, timezone
 from enum import Enum
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional, Set
 from uuid import NAMESPACE_URL, uuid5
 
 try:
@@ -21,52 +22,258 @@ class TxStatus(Enum):
     ERROR = "error"
 
 
+PARTITION_PREFIX = "bridge_tx_p"
+_PARTITION_RE = re.compile(rf"^{PARTITION_PREFIX}(\d{{12}})$")
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
 class BridgeStore:
-    def __init__(self, db_url: str) -> None:
+    """Transaction log partitioned by ``created_at``.
+
+    Rows live in range partitions of ``partition_interval``; the
+    maintenance job pre-creates upcoming partitions and drops whole
+    partitions once they fall outside ``retention_seconds`` (the
+    idempotency TTL). Duplicate checks only look inside that window, so
+    the in-memory fallback and Postgres agree on what counts as a replay.
+    ``init`` starts the maintenance job every ``maintenance_interval``
+    seconds (``None`` disables it); ``close`` stops it.
+    """
+
+    def __init__(
+        self,
+        db_url: str,
+        *,
+        retention_seconds: int = 3600,
+        partition_interval: timedelta = timedelta(days=1),
+        premake: int = 2,
+        maintenance_interval: Optional[float] = 300.0,
+        clock: Optional[Callable[[], datetime]] = None,
+    ) -> None:
         self.db_url = db_url
+        self.retention = timedelta(seconds=retention_seconds)
+        self.partition_interval = partition_interval
+        self.premake = premake
+        self.maintenance_interval = maintenance_interval
+        self.last_maintenance_error: Optional[BaseException] = None
+        self._maintenance_task: Optional[asyncio.Task] = None
+        self._clock = clock or (lambda: datetime.now(timezone.utc))
         self.pool: Optional[Any] = None
         self._in_memory = False
         self._memory_store: Dict[str, Dict[str, Any]] = {}
+        self._memory_by_id: Dict[int, Dict[str, Any]] = {}
+        self._memory_partitions: Dict[datetime, Dict[str, Dict[str, Any]]] = {}
+        self._known_partitions: Set[datetime] = set()
         self._id_counter = 0
         self._lock = asyncio.Lock()
 
     async def init(self) -> None:
         if self.db_url.startswith("memory://") or asyncpg is None:
             self._in_memory = True
-            return
-        try:
-            self.pool = await asyncpg.create_pool(self.db_url, min_size=1, max_size=5)  # type: ignore[attr-defined]
-            await self._create_tables()
-        except Exception:
-            self._in_memory = True
+        else:
+            try:
+                self.pool = await asyncpg.create_pool(self.db_url, min_size=1, max_size=5)  # type: ignore[attr-defined]
+            except Exception:
+                self._in_memory = True
+                self.pool = None
+        # Only an unreachable database falls back to memory; schema or
+        # migration failures must surface instead of silently losing
+        # durability.
+        if self.pool is not None:
+            try:
+                await self._create_tables()
+            except Exception:
+                await self.pool.close()
+                self.pool = None
+                raise
+        if self.maintenance_interval is not None and self._maintenance_task is None:
+            self._maintenance_task = asyncio.create_task(self.maintenance_loop(self.maintenance_interval))
+
+    async def close(self) -> None:
+        if self._maintenance_task is not None:
+            self._maintenance_task.cancel()
+            try:
+                await self._maintenance_task
+            except asyncio.CancelledError:
+                pass
+            self._maintenance_task = None
+        if self.pool is not None:
+            await self.pool.close()
             self.pool = None
 
     async def _create_tables(self) -> None:
         if self._in_memory or not self.pool or asyncpg is None:
             return
         async with self.pool.acquire() as conn:  # type: ignore[union-attr]
+            async with conn.transaction():
+                relkind = await conn.fetchval(
+                    "SELECT relkind FROM pg_class WHERE oid = to_regclass('bridge_tx')"
+                )
+                legacy = relkind == "r"
+                if legacy:
+                    await self._rename_legacy_table(conn)
+                await self._create_partitioned_table(conn)
+                now = self._clock()
+                try:
+                    # One extra interval of slack for clock skew against NOW().
+                    await self._ensure_partitions(
+                        conn, now, since=now - self.retention - self.partition_interval
+                    )
+                    if legacy:
+                        await self._copy_legacy_rows(conn)
+                except Exception:
+                    self._known_partitions.clear()
+                    raise
+
+    async def _rename_legacy_table(self, conn: Any) -> None:
+        """Move a pre-partitioning ``bridge_tx`` (and its indexes) aside."""
+        await conn.execute(
+            """
+            ALTER TABLE bridge_tx RENAME TO bridge_tx_legacy;
+            ALTER INDEX IF EXISTS bridge_tx_pkey RENAME TO bridge_tx_legacy_pkey;
+            ALTER INDEX IF EXISTS bridge_tx_mcp_id_key RENAME TO bridge_tx_legacy_mcp_id_key;
+            ALTER INDEX IF EXISTS idx_bridge_tx_status RENAME TO idx_bridge_tx_legacy_status;
+            ALTER INDEX IF EXISTS idx_bridge_tx_thread RENAME TO idx_bridge_tx_legacy_thread;
+            """
+        )
+
+    async def _copy_legacy_rows(self, conn: Any) -> None:
+        """Copy rows still inside the retention window into the partitions.
+
+        ``bridge_tx_legacy`` is kept for operators to inspect and drop.
+        """
+        await conn.execute(
+            """
+            INSERT INTO bridge_tx (id, mcp_id, thread_id, aip_msg_id, status, method,
+                                   created_at, updated_at, error_detail, retry_count)
+            SELECT id, mcp_id, thread_id, aip_msg_id, status, method,
+                   created_at, updated_at, error_detail, retry_count
+              FROM bridge_tx_legacy
+             WHERE created_at >= NOW() - $1::interval
+            """,
+            self.retention,
+        )
+        await conn.execute(
+            """
+            SELECT setval(
+                pg_get_serial_sequence('bridge_tx', 'id'),
+                GREATEST((SELECT MAX(id) FROM bridge_tx_legacy), 1)
+            )
+            """
+        )
+
+    async def _create_partitioned_table(self, conn: Any) -> None:
+        await conn.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS bridge_tx (
+                id BIGSERIAL,
+                mcp_id TEXT NOT NULL,
+                thread_id TEXT NOT NULL,
+                aip_msg_id TEXT,
+                status TEXT NOT NULL,
+                method TEXT,
+                created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+                updated_at TIMESTAMPTZ DEFAULT NOW(),
+                error_detail TEXT,
+                retry_count INT DEFAULT 0,
+                PRIMARY KEY (id, created_at)
+            ) PARTITION BY RANGE (created_at);
+            CREATE INDEX IF NOT EXISTS idx_bridge_tx_mcp ON bridge_tx(mcp_id, created_at);
+            CREATE INDEX IF NOT EXISTS idx_bridge_tx_dedup ON bridge_tx(mcp_id, created_at)
+                INCLUDE (id, thread_id, aip_msg_id, status, retry_count)
+                WHERE status = '{TxStatus.ACKED.value}';
+            CREATE INDEX IF NOT EXISTS idx_bridge_tx_status ON bridge_tx(status);
+            CREATE INDEX IF NOT EXISTS idx_bridge_tx_thread ON bridge_tx(thread_id);
+            """
+        )
+
+    def thread_for(self, method: str, mcp_id: str) -> str:
+        return str(uuid5(NAMESPACE_URL, f"mcp:{method}:{mcp_id}"))
+
+    # --------------------------------------------------------------- partitions
+    def partition_start(self, ts: datetime) -> datetime:
+        interval = self.partition_interval.total_seconds()
+        offset = (ts - _EPOCH).total_seconds()
+        return _EPOCH + timedelta(seconds=(offset // interval) * interval)
+
+    def partition_name(self, start: datetime) -> str:
+        return f"{PARTITION_PREFIX}{start:%Y%m%d%H%M}"
+
+    def _expired(self, start: datetime, now: datetime) -> bool:
+        return start + self.partition_interval <= now - self.retention
+
+    def _live(self, record: Dict[str, Any], now: datetime) -> bool:
+        return record["created_at"] >= now - self.retention
+
+    async def _ensure_partitions(self, conn: Any, now: datetime, *, since: Optional[datetime] = None) -> None:
+        bucket = self.partition_start(since or now)
+        last = self.partition_start(now) + self.partition_interval * self.premake
+        while bucket <= last:
+            bucket, current = bucket + self.partition_interval, bucket
+            if current in self._known_partitions:
+                continue
             await conn.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS {self.partition_name(current)}
+                PARTITION OF bridge_tx
+                FOR VALUES FROM ('{current.isoformat()}') TO ('{(current + self.partition_interval).isoformat()}')
                 """
-                CREATE TABLE IF NOT EXISTS bridge_tx (
-                    id SERIAL PRIMARY KEY,
-                    mcp_id TEXT UNIQUE NOT NULL,
-                    thread_id TEXT NOT NULL,
-                    aip_msg_id TEXT,
-                    status TEXT NOT NULL,
-                    method TEXT,
-                    created_at TIMESTAMPTZ DEFAULT NOW(),
-                    updated_at TIMESTAMPTZ DEFAULT NOW(),
-                    error_detail TEXT,
-                    retry_count INT DEFAULT 0
-                );
-                CREATE INDEX IF NOT EXISTS idx_bridge_tx_status ON bridge_tx(status);
-                CREATE INDEX IF NOT EXISTS idx_bridge_tx_thread ON bridge_tx(thread_id);
+            )
+            self._known_partitions.add(current)
+
+    async def run_maintenance(self) -> List[str]:
+        """Create upcoming partitions and drop expired ones.
+
+        Returns the names of the partitions that were dropped.
+        """
+        now = self._clock()
+        if self._in_memory or not self.pool or asyncpg is None:
+            async with self._lock:
+                return self._drop_memory_partitions(now)
+
+        dropped: List[str] = []
+        async with self.pool.acquire() as conn:  # type: ignore[union-attr]
+            await self._ensure_partitions(conn, now)
+            rows = await conn.fetch(
+                """
+                SELECT c.relname
+                  FROM pg_inherits i
+                  JOIN pg_class c ON c.oid = i.inhrelid
+                  JOIN pg_class p ON p.oid = i.inhparent
+                 WHERE p.relname = 'bridge_tx'
                 """
             )
+            for row in rows:
+                match = _PARTITION_RE.match(row["relname"])
+                if not match:
+                    continue
+                start = datetime.strptime(match.group(1), "%Y%m%d%H%M").replace(tzinfo=timezone.utc)
+                if self._expired(start, now):
+                    await conn.execute(f"DROP TABLE IF EXISTS {row['relname']}")
+                    self._known_partitions.discard(start)
+                    dropped.append(row["relname"])
+        return dropped
 
-    def thread_for(self, method: str, mcp_id: str) -> str:
-        return str(uuid5(NAMESPACE_URL, f"mcp:{method}:{mcp_id}"))
+    async def maintenance_loop(self, interval_seconds: float = 300.0) -> None:
+        while True:
+            try:
+                await self.run_maintenance()
+            except Exception as exc:
+                self.last_maintenance_error = exc
+            await asyncio.sleep(interval_seconds)
 
+    def _drop_memory_partitions(self, now: datetime) -> List[str]:
+        dropped: List[str] = []
+        for start in sorted(self._memory_partitions):
+            if not self._expired(start, now):
+                continue
+            for mcp_id, record in self._memory_partitions.pop(start).items():
+                if self._memory_store.get(mcp_id) is record:
+                    del self._memory_store[mcp_id]
+                self._memory_by_id.pop(record["id"], None)
+            dropped.append(self.partition_name(start))
+        return dropped
+
+    # ------------------------------------------------------------- transactions
     async def upsert_bridge_tx(
         self,
         *,
@@ -77,12 +284,20 @@ class BridgeStore:
     ) -> Dict[str, Any]:
         if self._in_memory or not self.pool or asyncpg is None:
             async with self._lock:
+                now = self._clock()
                 existing = self._memory_store.get(mcp_id)
-                if existing:
+                if existing and self._live(existing, now):
                     existing["status"] = status.value
                     existing["retry_count"] += 1
-                    existing["updated_at"] = datetime.now(timezone.utc)
+                    existing["updated_at"] = now
                     return existing
+                if existing:
+                    # The expired record is replaced; drop every reference so
+                    # it cannot outlive its partition.
+                    self._memory_by_id.pop(existing["id"], None)
+                    bucket = self._memory_partitions.get(self.partition_start(existing["created_at"]), {})
+                    if bucket.get(mcp_id) is existing:
+                        del bucket[mcp_id]
                 self._id_counter += 1
                 record = {
                     "id": self._id_counter,
@@ -91,31 +306,46 @@ class BridgeStore:
                     "aip_msg_id": None,
                     "status": status.value,
                     "method": method,
-                    "created_at": datetime.now(timezone.utc),
-                    "updated_at": datetime.now(timezone.utc),
+                    "created_at": now,
+                    "updated_at": now,
                     "error_detail": None,
                     "retry_count": 0,
                 }
                 self._memory_store[mcp_id] = record
+                self._memory_by_id[record["id"]] = record
+                self._memory_partitions.setdefault(self.partition_start(now), {})[mcp_id] = record
                 return record
 
         async with self.pool.acquire() as conn:  # type: ignore[union-attr]
-            row = await conn.fetchrow(
-                """
-                INSERT INTO bridge_tx (mcp_id, thread_id, method, status)
-                VALUES ($1, $2, $3, $4)
-                ON CONFLICT (mcp_id)
-                DO UPDATE SET
-                    status = EXCLUDED.status,
-                    updated_at = NOW(),
-                    retry_count = bridge_tx.retry_count + 1
-                RETURNING *
-                """,
-                mcp_id,
-                thread_id,
-                method,
-                status.value,
-            )
+            await self._ensure_partitions(conn, self._clock())
+            async with conn.transaction():
+                await conn.execute("SELECT pg_advisory_xact_lock(hashtext($1))", mcp_id)
+                row = await conn.fetchrow(
+                    """
+                    UPDATE bridge_tx
+                       SET status = $2,
+                           updated_at = NOW(),
+                           retry_count = retry_count + 1
+                     WHERE mcp_id = $1
+                       AND created_at >= NOW() - $3::interval
+                    RETURNING *
+                    """,
+                    mcp_id,
+                    status.value,
+                    self.retention,
+                )
+                if row is None:
+                    row = await conn.fetchrow(
+                        """
+                        INSERT INTO bridge_tx (mcp_id, thread_id, method, status)
+                        VALUES ($1, $2, $3, $4)
+                        RETURNING *
+                        """,
+                        mcp_id,
+                        thread_id,
+                        method,
+                        status.value,
+                    )
             return dict(row)
 
     async def update_bridge_tx(
@@ -128,15 +358,15 @@ class BridgeStore:
     ) -> None:
         if self._in_memory or not self.pool or asyncpg is None:
             async with self._lock:
-                for record in self._memory_store.values():
-                    if record["id"] == tx_id:
-                        record["status"] = status.value
-                        record["updated_at"] = datetime.now(timezone.utc)
-                        if aip_msg_id:
-                            record["aip_msg_id"] = aip_msg_id
-                        record["error_detail"] = error_detail
-                        return
-                raise KeyError(f"Transaction {tx_id} not found")
+                record = self._memory_by_id.get(tx_id)
+                if record is None:
+                    raise KeyError(f"Transaction {tx_id} not found")
+                record["status"] = status.value
+                record["updated_at"] = self._clock()
+                if aip_msg_id:
+                    record["aip_msg_id"] = aip_msg_id
+                record["error_detail"] = error_detail
+                return
 
         async with self.pool.acquire() as conn:  # type: ignore[union-attr]
             await conn.execute(
@@ -158,14 +388,28 @@ class BridgeStore:
         if self._in_memory or not self.pool or asyncpg is None:
             async with self._lock:
                 record = self._memory_store.get(mcp_id)
-                if record and record["status"] == TxStatus.ACKED.value:
+                if (
+                    record
+                    and record["status"] == TxStatus.ACKED.value
+                    and self._live(record, self._clock())
+                ):
                     return record
                 return None
 
+        # Literal status and column list let the planner use the partial
+        # covering index for an index-only scan, even with a generic plan.
         async with self.pool.acquire() as conn:  # type: ignore[union-attr]
             row = await conn.fetchrow(
-                "SELECT * FROM bridge_tx WHERE mcp_id = $1 AND status = $2",
+                f"""
+                SELECT id, mcp_id, thread_id, aip_msg_id, status, retry_count, created_at
+                  FROM bridge_tx
+                 WHERE mcp_id = $1
+                   AND status = '{TxStatus.ACKED.value}'
+                   AND created_at >= NOW() - $2::interval
+                 ORDER BY created_at DESC
+                 LIMIT 1
+                """,
                 mcp_id,
-                TxStatus.ACKED.value,
+                self.retention,
             )
             return dict(row) if row else None
@@ -1,8 +1,34 @@
 """Enhanced protocol translation with UIR converters."""
 from __future__ import annotations
 
+import json
+import re
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .schemas import SchemaRegistry
+
+MAPPINGS_PATH = Path(__file__).resolve().parent.parent / "configs" / "mappings.json"
+MCP_REQUEST_SCHEMA = "mcp.request.v0"
+AIP_MESSAGE_SCHEMA = "aip.message.v0"
+
+_MCP_SCHEMA_RE = re.compile(r"^mcp\.(?P<method>.+)\.v\d+$")
+
+
+@lru_cache(maxsize=None)
+def default_schema_registry() -> SchemaRegistry:
+    """Process-wide registry so schemas are compiled once."""
+    return SchemaRegistry()
+
+
+@lru_cache(maxsize=None)
+def default_mappings() -> Dict[str, str]:
+    if not MAPPINGS_PATH.exists():
+        return {}
+    with open(MAPPINGS_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)
 
 
 @dataclass
@@ -14,7 +40,15 @@ class TranslationResult:
 
 
 class ProtocolTranslator:
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        *,
+        schemas: Optional[SchemaRegistry] = None,
+        mappings: Optional[Dict[str, str]] = None,
+    ) -> None:
+        self.schemas = schemas or default_schema_registry()
+        self.mappings = default_mappings() if mappings is None else mappings
+        self.reverse_mappings = {aip: mcp for mcp, aip in self.mappings.items()}
         self.uir_converters = {
             "tools/filesystem/read": self._fs_read_to_evidence,
             "tools/github/create_pr": self._github_pr_to_plan,
@@ -31,6 +65,55 @@ class ProtocolTranslator:
 
         return TranslationResult(success=True, data=params, uir="generic.v0")
 
+    def validate_mcp_request(self, request: Dict[str, Any]) -> List[str]:
+        return self.schemas.validate(MCP_REQUEST_SCHEMA, request)
+
+    def build_aip_message(self, request: Dict[str, Any], translation: TranslationResult) -> Dict[str, Any]:
+        """Wrap a forward translation in an ``aip.message.v0`` envelope."""
+
+        content: Dict[str, Any] = {
+            "schema": f"mcp.{request['method']}.v0",
+            "body": request.get("params", {}),
+        }
+        if translation.uir is not None:
+            content["uir"] = translation.uir
+            content["uir_data"] = translation.data
+        return {
+            "aip_version": "0.1",
+            "msg_id": str(request["id"]),
+            "type": "TASK",
+            "content": content,
+            "trust": {"safety_tags": ["mcp:translated"]},
+        }
+
+    def validate_aip_message(self, message: Dict[str, Any]) -> List[str]:
+        return self.schemas.validate(AIP_MESSAGE_SCHEMA, message)
+
+    async def aip_to_mcp(self, message: Dict[str, Any]) -> TranslationResult:
+        """Convert an AIP task message back into an MCP tool request."""
+
+        errors = self.validate_aip_message(message)
+        if errors:
+            return TranslationResult(success=False, data={}, error="; ".join(errors))
+
+        schema = message["content"]["schema"]
+        mcp_schema = self.reverse_mappings.get(schema, schema)
+        match = _MCP_SCHEMA_RE.match(mcp_schema)
+        if not match:
+            return TranslationResult(success=False, data={}, error=f"No MCP mapping for {schema}")
+
+        request = {
+            "jsonrpc": "2.0",
+            "method": match.group("method"),
+            "params": message["content"]["body"],
+            "id": message.get("msg_id") or message.get("thread_id"),
+        }
+        errors = self.validate_mcp_request(request)
+        if errors:
+            return TranslationResult(success=False, data=request, error="; ".join(errors))
+
+        return TranslationResult(success=True, data=request)
+
     async def _fs_read_to_evidence(self, params: Dict[str, Any]) -> TranslationResult:
         return TranslationResult(
             success=True,
@@ -0,0 +1,83 @@
+"""Pre-encoded wire responses with ETags and optional gzip."""
+from __future__ import annotations
+
+import gzip
+import hashlib
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+from .crypto import canonical_json
+
+CONTENT_TYPE = "application/json"
+
+
+@dataclass(frozen=True)
+class WireReply:
+    status: int
+    headers: Dict[str, str]
+    body: bytes = b""
+
+
+@dataclass(frozen=True)
+class EncodedResponse:
+    """Response body encoded once and replayed as bytes.
+
+    The gzip body is a different representation, so it carries its own
+    strong ETag (``etag`` with a ``-gz`` suffix).
+    """
+
+    body: bytes
+    etag: str
+    gzip_body: Optional[bytes] = None
+    headers: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def gzip_etag(self) -> Optional[str]:
+        if self.gzip_body is None:
+            return None
+        return f'{self.etag[:-1]}-gz"'
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        """True when the client already holds either representation."""
+        if not if_none_match:
+            return False
+        known = {self.etag, self.gzip_etag}
+        for tag in if_none_match.split(","):
+            tag = tag.strip()
+            if tag == "*":
+                return True
+            if tag.startswith("W/"):
+                tag = tag[2:]
+            if tag in known:
+                return True
+        return False
+
+    def reply(self, *, if_none_match: Optional[str] = None, accept_gzip: bool = False) -> WireReply:
+        """Build the wire reply, answering ``304`` when the client holds the ETag."""
+        use_gzip = accept_gzip and self.gzip_body is not None
+        headers = {"ETag": self.gzip_etag if use_gzip else self.etag, **self.headers}
+        if self.gzip_body is not None:
+            headers["Vary"] = "Accept-Encoding"
+        if self.matches(if_none_match):
+            return WireReply(status=304, headers=headers)
+        headers["Content-Type"] = CONTENT_TYPE
+        if use_gzip:
+            headers["Content-Encoding"] = "gzip"
+            return WireReply(status=200, headers=headers, body=self.gzip_body)
+        return WireReply(status=200, headers=headers, body=self.body)
+
+
+def encode_response(response: Dict[str, Any], *, compress_min_bytes: Optional[int] = 1024) -> EncodedResponse:
+    """Serialize ``response`` once; gzip it if it is large enough to benefit.
+
+    Bodies use canonical JSON so that the ETag is stable across workers.
+    ``compress_min_bytes=None`` disables compression.
+    """
+    body = canonical_json(response)
+    etag = f'"{hashlib.sha256(body).hexdigest()}"'
+    gzip_body = None
+    if compress_min_bytes is not None and len(body) >= compress_min_bytes:
+        compressed = gzip.compress(body, mtime=0)
+        if len(compressed) < len(body):
+            gzip_body = compressed
+    return EncodedResponse(body=body, etag=etag, gzip_body=gzip_body)
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Translation throughput benchmark over the golden fixtures."""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from bridges.translator import ProtocolTranslator  # noqa: E402
+
+
+def load_golden(direction: str) -> List[Dict[str, Any]]:
+    fixtures = []
+    for test_file in sorted((ROOT / "tests" / "golden" / direction).glob("*.json")):
+        with open(test_file, "r", encoding="utf-8") as f:
+            fixtures.append(json.load(f))
+    return fixtures
+
+
+async def bench_mcp_to_aip(translator: ProtocolTranslator, fixtures: List[Dict[str, Any]], iterations: int) -> Dict[str, Any]:
+    # Validate input, translate, validate output: the same work aip_to_mcp does.
+    failures = 0
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for fixture in fixtures:
+            request = fixture["input"]
+            if translator.validate_mcp_request(request):
+                failures += 1
+                continue
+            result = await translator.mcp_to_uir(request["method"], request.get("params", {}))
+            message = translator.build_aip_message(request, result)
+            if translator.validate_aip_message(message) or result.uir != fixture["expected"]["content"]["uir"]:
+                failures += 1
+    elapsed = time.perf_counter() - start
+    return _summary(len(fixtures) * iterations, failures, elapsed)
+
+
+async def bench_aip_to_mcp(translator: ProtocolTranslator, fixtures: List[Dict[str, Any]], iterations: int) -> Dict[str, Any]:
+    failures = 0
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for fixture in fixtures:
+            result = await translator.aip_to_mcp(fixture["input"])
+            if not result.success or result.data != fixture["expected"]:
+                failures += 1
+    elapsed = time.perf_counter() - start
+    return _summary(len(fixtures) * iterations, failures, elapsed)
+
+
+def _summary(messages: int, failures: int, elapsed: float) -> Dict[str, Any]:
+    return {
+        "messages": messages,
+        "failures": failures,
+        "seconds": round(elapsed, 4),
+        "msgs_per_sec": round(messages / elapsed) if elapsed > 0 else None,
+    }
+
+
+async def run_benchmark(iterations: int) -> None:
+    translator = ProtocolTranslator()
+    results = {
+        "mcp_to_aip": await bench_mcp_to_aip(translator, load_golden("mcp_to_aip"), iterations),
+        "aip_to_mcp": await bench_aip_to_mcp(translator, load_golden("aip_to_mcp"), iterations),
+    }
+    print(json.dumps(results))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Bridge translation throughput benchmark")
+    parser.add_argument("--iterations", type=int, default=10000, help="Passes over the golden fixtures")
+    args = parser.parse_args()
+
+    asyncio.run(run_benchmark(args.iterations))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+import asyncio
+import json
+from uuid import uuid4
+
+import pytest
+
+from bridges.analytics import AnalyticsSink
+from bridges.core import MCPAIPBridge
+from bridges.store import BridgeStore
+from bridges.translator import TranslationResult
+
+
+class _FailingWrite(Exception):
+    pass
+
+
+async def _settle(rounds: int = 10) -> None:
+    for _ in range(rounds):
+        await asyncio.sleep(0)
+
+
+def _evidence(n):
+    return TranslationResult(success=True, uir="evidence.v0", data={"items": [{"type": "blob", "content": n}]})
+
+
+async def _offer(sink, n):
+    return await sink.offer(
+        thread_id=str(uuid4()),
+        method="tools/filesystem/read",
+        params={"patient_id": str(uuid4())},
+        translation=_evidence(n),
+    )
+
+
+@pytest.mark.asyncio
+async def test_query_evidence_rows_flush_in_batches_with_replay_safe_ids():
+    store = BridgeStore("memory://")
+    await store.init()
+    sink = AnalyticsSink("memory://", flush_size=2)
+    await sink.init()
+    bridge = MCPAIPBridge(store=store, analytics_sink=sink)
+    patient_a, patient_b = str(uuid4()), str(uuid4())
+    request = {
+        "jsonrpc": "2.0",
+        "method": "tools/postgres/query",
+        "params": {
+            "columns": ["patient_id", "phq9"],
+            "rows": [[patient_a, 12], [patient_b, 7], [patient_a, 9], ["not-a-uuid", 1]],
+        },
+        "id": "analytics-001",
+    }
+
+    await bridge.handle_mcp_request(request)
+    await _settle()
+
+    assert sink.pending == 0
+    rows = list(sink._memory_rows.values())
+    assert sorted(str(r[1]) for r in rows) == sorted([patient_a, patient_b])
+    by_patient = {str(r[1]): json.loads(r[4]) for r in rows}
+    assert by_patient[patient_a]["rows"] == [[patient_a, 12], [patient_a, 9]]
+    assert json.loads(rows[0][5])["thread_id"] == store.thread_for("tools/postgres/query", "analytics-001")
+
+    replay = MCPAIPBridge(store=BridgeStore("memory://"), analytics_sink=sink)
+    await replay.store.init()
+    await replay.handle_mcp_request(request)
+    await sink.flush()
+    assert len(sink._memory_rows) == 2
+    await replay.close()
+    await bridge.close()
+
+
+@pytest.mark.asyncio
+async def test_offer_starts_flusher_when_init_was_skipped():
+    sink = AnalyticsSink("memory://", flush_size=1)
+
+    await _offer(sink, 1)
+    await _settle()
+
+    assert sink.pending == 0
+    assert len(sink._memory_rows) == 1
+    await sink.close()
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_backs_off_and_keeps_buffer_bounded(monkeypatch):
+    sink = AnalyticsSink("memory://", flush_size=3, max_buffer=3, backoff_base=60.0)
+    await sink.init()
+    attempts = []
+
+    async def failing_write(batch):
+        attempts.append(len(batch))
+        raise _FailingWrite()
+
+    monkeypatch.setattr(sink, "_write", failing_write)
+    for n in range(10):
+        await _offer(sink, n)
+        await _settle()
+
+    assert attempts == [3]
+    assert sink.pending == 3
+    assert sink.dropped == 7
+    assert isinstance(sink.last_error, _FailingWrite)
+
+    generic = TranslationResult(success=True, uir="generic.v0", data={"patient_id": str(uuid4())})
+    assert await sink.offer(thread_id=str(uuid4()), method="x", params={}, translation=generic) == 0
+    await sink.close()
+
+
+@pytest.mark.asyncio
+async def test_close_records_failed_final_flush_and_releases_resources(monkeypatch):
+    closed = []
+
+    class _Pool:
+        async def close(self):
+            closed.append("pool")
+
+    class _Security:
+        async def aclose(self):
+            closed.append("security")
+
+    sink = AnalyticsSink("memory://", flush_size=100)
+    await sink.init()
+    sink.pool = _Pool()
+
+    async def failing_write(batch):
+        raise _FailingWrite()
+
+    monkeypatch.setattr(sink, "_write", failing_write)
+    await _offer(sink, 1)
+    bridge = MCPAIPBridge(store=BridgeStore("memory://"), security=_Security(), analytics_sink=sink)
+
+    await bridge.close()
+
+    assert closed == ["pool", "security"]
+    assert isinstance(sink.last_error, _FailingWrite)
+    assert sink.pending == 1
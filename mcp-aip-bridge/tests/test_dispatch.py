@@ -0,0 +1,126 @@
+import asyncio
+import os
+import signal
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from bridges.core import MCPAIPBridge
+from bridges.dispatch import HashRing, ShardedDispatcher
+from bridges.store import BridgeStore
+
+
+class _PidBridge(MCPAIPBridge):
+    async def handle_mcp_request(self, request):
+        response = await super().handle_mcp_request(request)
+        return {**response, "pid": os.getpid()}
+
+
+async def _pid_bridge_factory(name):
+    store = BridgeStore("memory://")
+    await store.init()
+    return _PidBridge(store=store)
+
+
+def test_ring_adding_node_moves_few_keys():
+    ring = HashRing(["w0", "w1", "w2", "w3"])
+    keys = [f"mcp-{i}" for i in range(2000)]
+    before = {k: ring.lookup(k) for k in keys}
+
+    ring.add("w4")
+    moved = [k for k in keys if ring.lookup(k) != before[k]]
+
+    assert all(ring.lookup(k) == "w4" for k in moved)
+    assert len(moved) < len(keys) * 0.35
+
+
+@pytest.mark.asyncio
+async def test_duplicates_land_on_same_worker_in_order():
+    store = BridgeStore("memory://")
+    await store.init()
+    seen = []
+
+    class _RecordingBridge(MCPAIPBridge):
+        async def handle_mcp_request(self, request):
+            seen.append((self.name, request["params"]["seq"]))
+            await asyncio.sleep(0)
+            return await super().handle_mcp_request(request)
+
+    def factory(name):
+        bridge = _RecordingBridge(store=store)
+        bridge.name = name
+        return bridge
+
+    dispatcher = ShardedDispatcher(factory, workers=3)
+    await dispatcher.start()
+    requests = [
+        {"jsonrpc": "2.0", "method": "tools/custom", "params": {"seq": i}, "id": "dup-shard-1"} for i in range(5)
+    ]
+
+    results = await asyncio.gather(*(dispatcher.dispatch(r) for r in requests))
+
+    workers = {name for name, _ in seen}
+    assert workers == {dispatcher.worker_for(requests[0])}
+    assert [seq for _, seq in seen] == list(range(5))
+    assert all(r == results[0] for r in results)
+    await dispatcher.close()
+
+
+@pytest.mark.asyncio
+async def test_pending_keys_stay_pinned_across_rebalance():
+    store = BridgeStore("memory://")
+    await store.init()
+    dispatcher = ShardedDispatcher(lambda name: MCPAIPBridge(store=store), workers=1)
+    await dispatcher.start()
+
+    request = {"jsonrpc": "2.0", "method": "tools/custom", "params": {}, "id": "pinned-1"}
+    pending = asyncio.ensure_future(dispatcher.dispatch(request))
+    await asyncio.sleep(0)
+    owner = dispatcher.worker_for(request)
+
+    for _ in range(7):
+        await dispatcher.add_worker()
+    assert dispatcher.worker_for(request) == owner
+
+    await pending
+    await dispatcher.remove_worker(owner)
+    assert owner not in dispatcher.worker_names
+    await dispatcher.close()
+
+
+@pytest.mark.asyncio
+async def test_process_workers_run_shards_in_separate_processes():
+    dispatcher = ShardedDispatcher(_pid_bridge_factory, workers=2, processes=True)
+    await dispatcher.start()
+    requests = [{"jsonrpc": "2.0", "method": "tools/custom", "params": {}, "id": f"proc-{i}"} for i in range(16)]
+    owners = {r["id"]: dispatcher.worker_for(r) for r in requests}
+    assert set(owners.values()) == set(dispatcher.worker_names)
+
+    responses = await asyncio.gather(*(dispatcher.dispatch(r) for r in requests))
+
+    pids = {name: await dispatcher.worker_pid(name) for name in dispatcher.worker_names}
+    assert len(set(pids.values())) == 2
+    assert os.getpid() not in pids.values()
+    for response in responses:
+        assert response["pid"] == pids[owners[response["id"]]]
+
+    replay = await dispatcher.dispatch(requests[0])
+    assert replay == responses[0]
+    await dispatcher.close()
+
+
+@pytest.mark.asyncio
+async def test_process_worker_recovers_after_child_dies():
+    dispatcher = ShardedDispatcher(_pid_bridge_factory, workers=1, processes=True)
+    await dispatcher.start()
+    name = dispatcher.worker_names[0]
+    first = await dispatcher.dispatch({"jsonrpc": "2.0", "method": "tools/custom", "params": {}, "id": "crash-0"})
+
+    os.kill(first["pid"], signal.SIGKILL)
+    with pytest.raises(BrokenProcessPool):
+        await dispatcher.dispatch({"jsonrpc": "2.0", "method": "tools/custom", "params": {}, "id": "crash-1"})
+
+    second = await dispatcher.dispatch({"jsonrpc": "2.0", "method": "tools/custom", "params": {}, "id": "crash-2"})
+    assert second["pid"] != first["pid"]
+    assert await dispatcher.worker_pid(name) == second["pid"]
+    await dispatcher.close()
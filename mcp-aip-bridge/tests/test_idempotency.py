@@ -3,6 +3,7 @@ import asyncio
 import pytest
 
 from bridges.core import MCPAIPBridge
+from bridges.schemas import SchemaValidationError
 from bridges.store import BridgeStore, TxStatus
 
 
@@ -32,3 +33,17 @@ async def test_duplicate_request_handling():
     assert tx is not None
     assert tx["status"] == TxStatus.ACKED.value
     assert tx["retry_count"] == 0
+    await bridge.close()
+
+
+@pytest.mark.asyncio
+async def test_invalid_request_is_rejected_before_logging():
+    store = BridgeStore("memory://")
+    await store.init()
+    bridge = MCPAIPBridge(store=store)
+
+    with pytest.raises(SchemaValidationError):
+        await bridge.handle_mcp_request({"method": "tools/custom", "params": [], "id": "bad-001"})
+
+    assert store._memory_store == {}
+    await bridge.close()
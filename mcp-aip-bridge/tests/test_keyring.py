@@ -0,0 +1,155 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from nacl.encoding import Base64Encoder
+from nacl.signing import SigningKey
+
+from bridges.core import MCPAIPBridge
+from bridges.crypto import verify_signature
+from bridges.keyring import KeyRing, KeyRingError
+from bridges.store import BridgeStore
+
+
+class _Clock:
+    def __init__(self):
+        self.now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    def __call__(self):
+        return self.now
+
+
+def _seed_b64(key: SigningKey) -> str:
+    return key.encode(encoder=Base64Encoder).decode()
+
+
+def test_rotation_keeps_old_signatures_verifiable(tmp_path):
+    clock = _Clock()
+    ring = KeyRing(rotation_days=30, retain_days=7, key_dir=tmp_path, clock=clock)
+    ring.rotate(key_id="k1")
+
+    old_msg = ring.sign({"content": {"n": 1}})
+    assert old_msg["trust"]["sig_key_id"] == "k1"
+
+    clock.now += timedelta(days=31)
+    assert ring.needs_rotation()
+    ring.maybe_rotate()
+    assert ring.active_key_id != "k1"
+
+    new_msg = ring.sign({"content": {"n": 2}})
+    assert ring.verify_many([old_msg, new_msg]) == [True, True]
+
+    # The generated key was published, so a peer sharing the directory verifies it.
+    peer = KeyRing.from_directory(tmp_path, clock=clock)
+    assert peer.active_key_id == ring.active_key_id
+    assert peer.verify(new_msg)
+
+    clock.now += timedelta(days=8)
+    assert ring.prune() == ["k1"]
+    assert "k1" not in ring._keys
+    assert ring.verify(old_msg) is False
+    assert ring.prune() == []
+
+
+def test_unknown_key_ids_rescan_directory_at_most_once_per_interval(tmp_path, monkeypatch):
+    clock = _Clock()
+    ring = KeyRing(key_dir=tmp_path, clock=clock, reload_interval=5)
+    ring.rotate(key_id="k1")
+    scans = []
+    original_reload = ring.reload
+    monkeypatch.setattr(ring, "reload", lambda: scans.append(1) or original_reload())
+
+    forged = [{"content": "x", "trust": {"sig_key_id": f"nope-{n}", "signature": "AA=="}} for n in range(50)]
+    assert ring.verify_many(forged) == [False] * 50
+    assert ring.verify(forged[0]) is False
+    assert len(scans) == 1
+
+    # A key a peer publishes later is picked up once the interval passes,
+    # without taking over as this ring's signing key.
+    peer = SigningKey.generate()
+    (tmp_path / "peer.key").write_text(_seed_b64(peer))
+    clock.now += timedelta(seconds=6)
+    peer_ring = KeyRing(clock=clock)
+    peer_ring.add_signing_key("peer", peer, created_at=clock.now - timedelta(seconds=1))
+    assert ring.verify(peer_ring.sign({"content": "p"}))
+    assert len(scans) == 2
+    assert ring.active_key_id == "k1"
+
+
+def test_rotation_without_directory_uses_staged_keys_only():
+    clock = _Clock()
+    ring = KeyRing(rotation_days=30, clock=clock)
+    ring.add_signing_key("v1", SigningKey.generate(), created_at=clock.now)
+    ring.add_signing_key("v2", SigningKey.generate(), created_at=clock.now + timedelta(days=30))
+    assert ring.active_key_id == "v1"
+
+    staged_msg = {"content": "pre"}
+    assert ring.verifier("v2") is not None
+
+    clock.now += timedelta(days=30)
+    assert ring.maybe_rotate().key_id == "v2"
+    assert ring.verify(ring.sign(staged_msg))
+
+    clock.now += timedelta(days=31)
+    assert ring.maybe_rotate() is None
+    assert ring.active_key_id == "v2"
+    with pytest.raises(KeyRingError):
+        ring.rotate()
+
+
+def test_verify_many_groups_and_preserves_order():
+    ring = KeyRing()
+    ring.add_signing_key("a", SigningKey.generate())
+    msg_a = ring.sign({"content": "a"})
+    ring.add_signing_key("b", SigningKey.generate(), created_at=datetime.now(timezone.utc) + timedelta(seconds=1))
+    msg_b = ring.sign({"content": "b"})
+
+    tampered = dict(msg_a, content="evil")
+    unknown = {"content": "x", "trust": {"sig_key_id": "missing", "signature": "AA=="}}
+    bad_padding = {"content": "a", "trust": {"sig_key_id": "a", "signature": "abc"}}
+    bad_trust = {"content": "a", "trust": "not-a-dict"}
+
+    assert ring.verify_many([msg_b, tampered, msg_a, unknown, bad_padding, bad_trust]) == [
+        True, False, True, False, False, False,
+    ]
+    assert ring.verify(bad_padding) is False
+
+
+def test_from_env_and_directory(tmp_path):
+    legacy = SigningKey.generate()
+    current = SigningKey.generate()
+    ring = KeyRing.from_env(
+        {"ED25519_PRIVKEY_B64": _seed_b64(legacy), "BRIDGE_SIGNING_KEYS": f"v2:{_seed_b64(current)}"}
+    )
+    assert ring.active_key_id == "v2"
+    assert verify_signature(ring.public_key_b64("v2"), ring.sign({"content": "x"}))
+
+    (tmp_path / "peer.pub").write_text(legacy.verify_key.encode(encoder=Base64Encoder).decode())
+    (tmp_path / "self.key").write_text(_seed_b64(current))
+    loaded = KeyRing.from_directory(tmp_path)
+    assert loaded.active_key_id == "self"
+    assert loaded.verifier("peer") is not None
+
+    with pytest.raises(KeyRingError):
+        KeyRing.from_env({"BRIDGE_SIGNING_KEYS": "no-seed"})
+
+    staged = KeyRing.from_env(
+        {"BRIDGE_SIGNING_KEYS": f"v1:{_seed_b64(legacy)},v2:{_seed_b64(current)}:2999-01-01T00:00:00"}
+    )
+    assert staged.active_key_id == "v1"
+
+
+@pytest.mark.asyncio
+async def test_bridge_signs_with_active_key():
+    store = BridgeStore("memory://")
+    await store.init()
+    ring = KeyRing()
+    ring.rotate(new_key=SigningKey.generate(), key_id="bridge-ed25519-v2")
+    bridge = MCPAIPBridge(store=store, keyring=ring)
+
+    response = await bridge.handle_mcp_request(
+        {"jsonrpc": "2.0", "method": "tools/custom", "params": {}, "id": "kr-001"}
+    )
+
+    assert response["trust"]["sig_key_id"] == "bridge-ed25519-v2"
+    assert ring.verify(response)
+    await bridge.close()
@@ -0,0 +1,21 @@
+import pytest
+
+from bridges.schemas import SchemaCompileError, SchemaRegistry, compile_schema
+
+
+def test_registry_compiles_repo_schemas_once():
+    registry = SchemaRegistry()
+
+    assert {"mcp.request.v0", "aip.message.v0"} <= set(registry.schema_ids)
+    assert registry.validator("mcp.request.v0") is registry.validator("mcp.request.v0")
+    assert registry.validate("mcp.request.v0", {"jsonrpc": "2.0", "method": "tools/x", "id": 1}) == []
+    assert registry.validate("mcp.request.v0", {"jsonrpc": "1.0", "method": "", "id": True}) == [
+        "$.jsonrpc: expected '2.0'",
+        "$.method: shorter than 1",
+        "$.id: expected string|integer",
+    ]
+
+
+def test_unsupported_keyword_is_rejected():
+    with pytest.raises(SchemaCompileError):
+        compile_schema({"oneOf": [{"type": "string"}]})
@@ -0,0 +1,191 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from bridges.store import BridgeStore, TxStatus
+
+
+class _Clock:
+    def __init__(self):
+        self.now = datetime(2024, 3, 1, 12, tzinfo=timezone.utc)
+
+    def __call__(self):
+        return self.now
+
+
+async def _acked(store, mcp_id):
+    tx = await store.upsert_bridge_tx(
+        mcp_id=mcp_id,
+        thread_id=store.thread_for("tools/custom", mcp_id),
+        method="tools/custom",
+        status=TxStatus.QUEUED,
+    )
+    await store.update_bridge_tx(tx_id=tx["id"], status=TxStatus.ACKED)
+    return tx
+
+
+@pytest.mark.asyncio
+async def test_duplicates_expire_with_ttl_and_partitions_drop():
+    clock = _Clock()
+    store = BridgeStore(
+        "memory://", retention_seconds=3600, partition_interval=timedelta(hours=1), clock=clock
+    )
+    await store.init()
+
+    first = await _acked(store, "ret-001")
+    assert await store.check_duplicate("ret-001") is not None
+
+    clock.now += timedelta(minutes=61)
+    assert await store.check_duplicate("ret-001") is None
+    assert await store.run_maintenance() == []
+
+    second = await _acked(store, "ret-001")
+    assert second["id"] != first["id"]
+    assert second["retry_count"] == 0
+
+    clock.now += timedelta(hours=1)
+    assert await store.run_maintenance() == ["bridge_tx_p202403011200"]
+    assert await store.check_duplicate("ret-001") is not None
+
+    clock.now += timedelta(hours=2)
+    assert await store.run_maintenance() == ["bridge_tx_p202403011300"]
+    assert store._memory_store == {}
+    with pytest.raises(KeyError):
+        await store.update_bridge_tx(tx_id=second["id"], status=TxStatus.ERROR)
+    await store.close()
+
+
+@pytest.mark.asyncio
+async def test_resubmissions_within_one_partition_do_not_accumulate():
+    clock = _Clock()
+    store = BridgeStore("memory://", retention_seconds=60, maintenance_interval=None, clock=clock)
+    await store.init()
+
+    ids = set()
+    for _ in range(5):
+        ids.add((await _acked(store, "resubmit-001"))["id"])
+        clock.now += timedelta(seconds=61)
+    assert len(ids) == 5
+    assert len(store._memory_by_id) == 1
+
+    clock.now += timedelta(days=2)
+    await store.run_maintenance()
+    assert store._memory_store == {}
+    assert store._memory_by_id == {}
+
+
+def test_partition_bucketing():
+    store = BridgeStore("memory://", partition_interval=timedelta(days=1))
+    start = store.partition_start(datetime(2024, 3, 1, 17, 45, tzinfo=timezone.utc))
+
+    assert start == datetime(2024, 3, 1, tzinfo=timezone.utc)
+    assert store.partition_name(start) == "bridge_tx_p202403010000"
+
+
+class _FakeConn:
+    def __init__(self, relkind, fail_on=None):
+        self.relkind = relkind
+        self.fail_on = fail_on
+        self.statements = []
+
+    def transaction(self):
+        return _AsyncNull()
+
+    async def fetchval(self, sql, *args):
+        return self.relkind
+
+    async def execute(self, sql, *args):
+        self.statements.append(" ".join(sql.split()))
+        if self.fail_on and self.fail_on in sql:
+            raise RuntimeError("ddl failed")
+
+
+class _AsyncNull:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class _FakePool:
+    def __init__(self, conn):
+        self.conn = conn
+        self.closed = False
+
+    def acquire(self):
+        pool = self
+
+        class _Acquire:
+            async def __aenter__(self):
+                return pool.conn
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return _Acquire()
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.mark.asyncio
+async def test_legacy_table_is_migrated_into_partitions():
+    conn = _FakeConn("r")
+    store = BridgeStore("postgresql://unused", partition_interval=timedelta(hours=1))
+    store.pool = _FakePool(conn)
+
+    await store._create_tables()
+
+    assert conn.statements[0].startswith("ALTER TABLE bridge_tx RENAME TO bridge_tx_legacy")
+    assert "PARTITION BY RANGE (created_at)" in conn.statements[1]
+    copy = next(i for i, s in enumerate(conn.statements) if s.startswith("INSERT INTO bridge_tx"))
+    assert all("PARTITION OF bridge_tx" in s for s in conn.statements[2:copy])
+    assert "FROM bridge_tx_legacy" in conn.statements[copy]
+    assert "setval" in conn.statements[copy + 1]
+
+    fresh = _FakeConn("p")
+    store = BridgeStore("postgresql://unused")
+    store.pool = _FakePool(fresh)
+    await store._create_tables()
+    assert not any("bridge_tx_legacy" in s for s in fresh.statements)
+
+
+@pytest.mark.asyncio
+async def test_schema_failure_raises_instead_of_falling_back(monkeypatch):
+    pool = _FakePool(_FakeConn(None, fail_on="PARTITION BY RANGE"))
+
+    async def create_pool(*args, **kwargs):
+        return pool
+
+    monkeypatch.setattr("bridges.store.asyncpg.create_pool", create_pool)
+    store = BridgeStore("postgresql://unused", maintenance_interval=None)
+
+    with pytest.raises(RuntimeError):
+        await store.init()
+    assert store._in_memory is False
+    assert pool.closed is True
+
+
+@pytest.mark.asyncio
+async def test_init_starts_maintenance_job():
+    clock = _Clock()
+    store = BridgeStore(
+        "memory://",
+        partition_interval=timedelta(hours=1),
+        maintenance_interval=0.01,
+        clock=clock,
+    )
+    await store.init()
+    await _acked(store, "job-001")
+
+    clock.now += timedelta(hours=3)
+    for _ in range(50):
+        if not store._memory_partitions:
+            break
+        await asyncio.sleep(0.01)
+
+    assert store._memory_partitions == {}
+    await store.close()
+    assert store._maintenance_task is None
@@ -1,7 +1,12 @@
+import json
+from pathlib import Path
+
 import pytest
 
 from bridges.translator import ProtocolTranslator
 
+GOLDEN_AIP_TO_MCP = Path(__file__).parent / "golden" / "aip_to_mcp"
+
 
 @pytest.mark.asyncio
 async def test_filesystem_translation_to_uir():
@@ -24,3 +29,38 @@ async def test_unknown_method_uses_generic_translator():
 
     assert result.uir == "generic.v0"
     assert result.data == params
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("fixture", sorted(GOLDEN_AIP_TO_MCP.glob("*.json")), ids=lambda p: p.stem)
+async def test_aip_to_mcp_golden(fixture):
+    translator = ProtocolTranslator()
+    golden = json.loads(fixture.read_text())
+
+    result = await translator.aip_to_mcp(golden["input"])
+
+    assert result.success is True
+    assert result.data == golden["expected"]
+
+
+@pytest.mark.asyncio
+async def test_aip_to_mcp_rejects_invalid_message():
+    translator = ProtocolTranslator()
+
+    result = await translator.aip_to_mcp({"aip_version": "0.1", "type": "BOGUS", "content": {}})
+
+    assert result.success is False
+    assert "$.type" in result.error
+    assert "'schema'" in result.error
+
+
+@pytest.mark.asyncio
+async def test_forward_envelope_validates_against_aip_schema():
+    translator = ProtocolTranslator()
+    request = {"jsonrpc": "2.0", "method": "tools/filesystem/read", "params": {"path": "/tmp/a"}, "id": 7}
+
+    result = await translator.mcp_to_uir(request["method"], request["params"])
+    message = translator.build_aip_message(request, result)
+
+    assert translator.validate_aip_message(message) == []
+    assert message["content"]["schema"] == "mcp.tools/filesystem/read.v0"
@@ -0,0 +1,87 @@
+import gzip
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import bridges.core as core
+from bridges.core import MCPAIPBridge
+from bridges.store import BridgeStore
+from bridges.wire import encode_response
+
+
+class _Clock:
+    def __init__(self):
+        self.now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    def __call__(self):
+        return self.now
+
+
+def test_encode_response_etag_and_gzip():
+    small = encode_response({"id": "a", "data": {}})
+    assert small.gzip_body is None
+    assert small.reply(if_none_match=small.etag).status == 304
+    assert small.reply(if_none_match=f'W/{small.etag}, "other"').status == 304
+    assert small.reply(if_none_match='"other"').status == 200
+
+    large = encode_response({"id": "b", "data": {"content": "x" * 4096}})
+    reply = large.reply(accept_gzip=True)
+    identity = large.reply()
+    assert reply.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(reply.body) == large.body
+    assert reply.headers["ETag"] == large.gzip_etag != identity.headers["ETag"]
+    assert reply.headers["Vary"] == identity.headers["Vary"] == "Accept-Encoding"
+    assert "Vary" not in small.reply().headers
+    assert large.reply(if_none_match=large.gzip_etag).status == 304
+
+
+@pytest.mark.asyncio
+async def test_duplicate_replay_serves_cached_bytes(monkeypatch):
+    store = BridgeStore("memory://")
+    await store.init()
+    bridge = MCPAIPBridge(store=store)
+    request = {
+        "jsonrpc": "2.0",
+        "method": "tools/filesystem/read",
+        "params": {"path": "/tmp/notes.md", "content": "hello"},
+        "id": "wire-001",
+    }
+
+    first = await bridge.handle_mcp_request_encoded(request)
+    assert first.status == 200
+    assert json.loads(first.body)["id"] == "wire-001"
+
+    calls = []
+    monkeypatch.setattr(core, "encode_response", lambda *a, **k: calls.append(a))
+    replay = await bridge.handle_mcp_request_encoded(request)
+    assert replay.body is first.body
+    assert calls == []
+
+    conditional = await bridge.handle_mcp_request_encoded(request, if_none_match=first.headers["ETag"])
+    assert conditional.status == 304
+    assert conditional.body == b""
+    await bridge.close()
+
+
+@pytest.mark.asyncio
+async def test_response_caches_are_bounded_and_expire_with_the_store_ttl():
+    clock = _Clock()
+    store = BridgeStore("memory://", retention_seconds=60, clock=clock)
+    await store.init()
+    bridge = MCPAIPBridge(store=store, cache_size=2)
+
+    def request(n):
+        return {"jsonrpc": "2.0", "method": "tools/custom", "params": {}, "id": f"bounded-{n}"}
+
+    for n in range(3):
+        await bridge.handle_mcp_request_encoded(request(n))
+    assert set(bridge._response_cache) == set(bridge._encoded_cache) == {"bounded-1", "bounded-2"}
+
+    clock.now += timedelta(seconds=61)
+    await bridge.handle_mcp_request_encoded(request(2))
+    await bridge.handle_mcp_request(request(1))
+    assert "bounded-1" in bridge._response_cache
+    assert set(bridge._encoded_cache) == {"bounded-2"}
+    assert len(bridge._cached_at) == 2
+    await bridge.close()